@@ -0,0 +1,63 @@
+"""Alignment of several countries on a common "days since the Nth case" axis.
+
+Everything works on a (country, day) array of cumulative counts: the day every country crosses
+the threshold is found for all rows at once and the rows are shifted with a single gather,
+so comparing 20 countries is one array operation instead of a loop over their dfs.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import constants as const
+import countries
+import cube
+import data
+
+
+def cumulative(slugs, label):
+    """Function returns the (country, day) array of a label's cumulative counts for the slugs.
+    Rows come from the cube when it has every country, else from each country's df padded with NaN"""
+    if slugs and all(cube.has(slug) for slug in slugs):
+        _, array = cube.load()
+        rows = [cube.country_index()[slug] for slug in slugs]
+        return array[rows, :, cube.METRIC_INDEX[label]].astype(np.float64)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(slugs), const.POOL_SIZE))) as executor:
+        series = list(executor.map(lambda slug: data.get_total_daily_df(slug, label)['Cases'].to_numpy(), slugs))
+    result = np.full((len(slugs), max((len(values) for values in series), default=0)), np.nan)
+    for row, values in enumerate(series):
+        result[row, :len(values)] = values
+    return result
+
+
+def align(cumulative, threshold):
+    """Function shifts every row so day 0 is the first day at or above threshold, returns (aligned, found).
+    Days past the end of a row are NaN, rows that never reach the threshold are all NaN (found is False)"""
+    cumulative = np.asarray(cumulative, dtype=np.float64)
+    n_countries, n_days = cumulative.shape
+    if n_days == 0:
+        return cumulative, np.zeros(n_countries, dtype=bool)
+    reached = cumulative >= threshold  # NaN padding never reaches it.
+    found = reached.any(axis=1)
+    offsets = reached.argmax(axis=1)
+
+    index = offsets[:, None] + np.arange(n_days)[None, :]
+    shifted = np.take_along_axis(cumulative, np.minimum(index, n_days - 1), axis=1)
+    valid = (index < n_days) & found[:, None] & ~np.isnan(shifted)
+    aligned = np.where(valid, shifted, np.nan)
+
+    # Trailing days no country has reached yet are dropped.
+    length = int(valid.sum(axis=1).max()) if n_countries else 0
+    return aligned[:, :length], found
+
+
+def per_capita(values, slugs):
+    """Function scales every row to counts per const.PER_CAPITA people, rows without a population become NaN"""
+    populations = np.array([countries.slug_to_population().get(slug, np.nan) for slug in slugs], dtype=np.float64)
+    return values / populations[:, None] * const.PER_CAPITA
+
+
+def compare(slugs, label, scale=False):
+    """Function returns (aligned, found) of the slugs by days since const.ALIGNMENTS[label] was reached"""
+    aligned, found = align(cumulative(slugs, label), const.ALIGNMENTS[label])
+    if scale:
+        aligned = per_capita(aligned, slugs)
+    return aligned, found
@@ -1,16 +1,31 @@
+import json
+from urllib.parse import quote
 import dash
 import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 import constants as const
+import countries
 import data
-import ast
 import pandas as pd
 from datetime import datetime as dt
 import graph_generator as graph_gen
+import cube
+import store
+import figure_cache
+import prefetch
+import telemetry
+import profiling
+import compression
+import singleflight
+import cache
+import pyramid
+import alignment
 import dash_bootstrap_components as dbc
+import plotly
 import plotly.graph_objs as go
+import flask
 
 # Initializing the web application.
 app = dash.Dash(external_stylesheets=[dbc.themes.DARKLY])
@@ -34,7 +49,7 @@ navbar = dbc.NavbarSimple(
 
 country_dropdown = dcc.Dropdown(
     id='countries-dropdown',
-    options=const.COUNTRY_DROPDOWN,
+    options=countries.dropdown_options(),
     value='united-states',
     clearable=False,
 )
@@ -68,16 +83,18 @@ summary_tab = dbc.Card(
 overview_tab = dbc.Card(
     dbc.CardBody(
         [
-            dcc.DatePickerSingle(
+            dcc.DatePickerRange(
                 id='overview-date-picker',
                 initial_visible_month=dt.now(),
-                placeholder='Select Date',
+                start_date_placeholder_text='Start Date',
+                end_date_placeholder_text='End Date',
                 display_format='MMM Do, YY',
+                minimum_nights=0,
                 style=dict(padding=10)
             ),
-            html.H4('Daily Cases', id='daily-cases'),
-            html.H4('Daily Recovered', id='daily-recovered'),
-            html.H4('Daily Deaths', id='daily-deaths'),
+            html.H4('Cases', id='daily-cases'),
+            html.H4('Recovered', id='daily-recovered'),
+            html.H4('Deaths', id='daily-deaths'),
         ], style={'text-align': 'center', 'background': const.PRIMARY_HEX}
     ), style=dict(background='white')
 )
@@ -99,215 +116,436 @@ stat_selector = dbc.Tabs(
     ], className='nav-justified'
 )
 
-app.layout = html.Div([
-
-    html.Div([
-        dcc.Store(id='confirmed-data', storage_type='local'),
-        dcc.Store(id='recovered-data', storage_type='local'),
-        dcc.Store(id='deaths-data', storage_type='local'),
-        dcc.Store(id='world-summary-data', storage_type='local',
-                  data=data.get_summary()),
-        dcc.Store(id='current-country', storage_type='local'),
-    ], id='local-storage'),
-
-    html.Div([
-        navbar
-    ], id='banner'),
-
-    html.Div([
-        country_dropdown,
-        graph_dropdown,
-
-        dbc.Alert(
-            "Unable to perform query! Showing previous selected country data",
-            id="alert",
-            dismissable=False,
-            fade=True,
-            is_open=False,
-            color='danger',
-            duration=2000
+
+def serve_layout():
+    """Function builds the layout on every page load, so each one gets the latest summary snapshot"""
+    return html.Div([
+
+        html.Div([
+            # Held in memory only: a copy in localStorage would override the version sent here. The summary
+            # itself stays on the server, the version only tells open pages when to re-render it.
+            # Dash also builds the layout once at import to validate it, only page loads reach upstream.
+            dcc.Store(id='world-summary-version', storage_type='memory',
+                      data=data.get_summary_version(refresh=flask.has_request_context())),
+            dcc.Interval(id='summary-interval', interval=const.SUMMARY_POLL_INTERVAL * 1000),
+            dcc.Store(id='current-country', storage_type='local'),
+            # Server-side handles of the dfs on screen, later callbacks resolve them instead of decoding the stores.
+            dcc.Store(id='data-handles', storage_type='memory'),
+            # URL of the continent map, versioned by the summary so the browser caches each map.
+            dcc.Store(id='map-url', storage_type='memory'),
+        ], id='local-storage'),
+
+        html.Div([
+            navbar
+        ], id='banner'),
+
+        html.Div([
+            country_dropdown,
+            graph_dropdown,
+
+            dbc.Alert(
+                "Unable to perform query! Showing previous selected country data",
+                id="alert",
+                dismissable=False,
+                fade=True,
+                is_open=False,
+                color='danger',
+                duration=2000
+            ),
+
+        ], id='dropdowns'),
+
+        dcc.ConfirmDialog(
+            id='warning',
+            message=const.WARNING_MESSAGE,
         ),
 
-    ], id='dropdowns'),
+        html.Div([
+            dcc.Graph(id="main-graph", config=dict(displaylogo=False), figure=go.Figure(data=[], layout=dict(
+                xaxis=dict(visible=False), yaxis=dict(visible=False), paper_bgcolor='#222222', plot_bgcolor='#222222'))),
+        ], className='graph'),
+
+        html.Div([
+            dcc.Dropdown(id='compare-dropdown', options=countries.dropdown_options(), value=const.COMPARE_DEFAULT,
+                         multi=True, placeholder='Countries to compare'),
+            dcc.RadioItems(id='compare-alignment', options=const.ALIGNMENT_OPTIONS, value='confirmed', inline=True,
+                           inputStyle=dict(margin='0 5px 0 15px')),
+            dcc.Checklist(id='compare-options', options=[dict(label='Per {:,} people'.format(const.PER_CAPITA),
+                                                              value='per-capita')], value=[], inline=True,
+                          inputStyle=dict(margin='0 5px 0 15px')),
+            dcc.Graph(id='comparison-graph', config=dict(displaylogo=False)),
+        ], id='comparison', className='graph'),
+
+        html.Div([
+            stat_selector
+        ]),
+
+        html.Div([
+            dcc.Graph(id='map', config=dict(scrollZoom=False, displaylogo=False, displayModeBar=False))
+        ]),
+    ])
+
+
+app.layout = serve_layout
+
+# Metrics of the callbacks, upstream requests and caches on /metrics, and opt-in profiling.
+telemetry.instrument(app.server)
+profiling.instrument(app.server)
+# Registered last so it runs first: the sizes recorded by telemetry are the bytes sent.
+compression.instrument(app.server)
+
+
+def cache_requests():
+    """Helper function to collect the lookups of every cache for /metrics"""
+    disk = cache.stats()
+    requests = {('disk', 'hit'): disk['hits'], ('disk', 'stale_hit'): disk['stale_hits'],
+                ('disk', 'miss'): disk['misses']}
+    for name, figures in [('graphs', figure_cache.graphs), ('maps', figure_cache.maps)]:
+        stats = figures.stats()
+        requests[(name, 'hit')] = stats['hits']
+        requests[(name, 'shared_hit')] = stats['shared_hits']
+        requests[(name, 'miss')] = stats['misses']
+    return requests
+
+
+def cache_hit_ratios():
+    """Helper function to compute the hit ratio (stale hits included) of every cache for /metrics"""
+    totals, hits = {}, {}
+    for (name, result), count in telemetry.aggregated('cache_requests').items():
+        totals[(name,)] = totals.get((name,), 0) + count
+        if result != 'miss':
+            hits[(name,)] = hits.get((name,), 0) + count
+    return {name: hits.get(name, 0) / total for name, total in totals.items() if total}
+
+
+def circuit_breaker_requests():
+    """Helper function to collect the circuit breaker state (1 while open) and fail-fast count for /metrics"""
+    stats = data.breaker.stats()
+    return {('open',): int(stats['state'] != 'closed'), ('rejected',): stats['rejected']}
+
+
+def coalesced_fetches():
+    """Helper function to collect the fetches shared by single-flight for /metrics"""
+    stats = singleflight.stats()
+    return {('thread',): stats['coalesced_threads'], ('process',): stats['coalesced_processes'],
+            ('fresh',): stats['fresh']}
+
+
+telemetry.register(telemetry.Gauge('cache_requests', 'Lookups per cache and result.', ('cache', 'result'),
+                                   cache_requests))
+telemetry.register(telemetry.Gauge('cache_hit_ratio', 'Hit ratio per cache.', ('cache',), cache_hit_ratios,
+                                   per_process=False))
+telemetry.register(telemetry.Gauge('upstream_circuit', 'Upstream requests by circuit breaker outcome.',
+                                   ('result',), circuit_breaker_requests))
+telemetry.register(telemetry.Gauge('upstream_fetches_coalesced',
+                                   'Fetches served by a fetch already in flight, or (fresh) by a copy written '
+                                   'just before the lock was taken.', ('scope',), coalesced_fetches))
 
-    dcc.ConfirmDialog(
-        id='warning',
-        message=const.WARNING_MESSAGE,
-    ),
 
-    html.Div([
-        dcc.Graph(id="main-graph", config=dict(displaylogo=False), figure=go.Figure(data=[], layout=dict(
-            xaxis=dict(visible=False), yaxis=dict(visible=False), paper_bgcolor='#222222', plot_bgcolor='#222222'))),
-    ], className='graph'),
+@app.callback(
+    [Output('current-country', 'data'),
+     Output('data-handles', 'data'),
+     Output('main-graph', 'figure'),
+     Output('daily-cases', 'children'),
+     Output('daily-deaths', 'children'),
+     Output('daily-recovered', 'children'),
+     Output('overview-date-picker', 'min_date_allowed'),
+     Output('overview-date-picker', 'max_date_allowed'),
+     Output('total_cases_in_table', 'children'),
+     Output('total_deaths_in_table', 'children'),
+     Output('total_recovered_in_table', 'children'),
+     Output('recovery_rate_in_table', 'children'),
+     Output('death_rate_in_table', 'children'),
+     Output('map-url', 'data'),
+     Output("alert", "is_open"),
+     Output('alert', 'children')],
+    [Input('countries-dropdown', 'value')],
+    [State('graphs-dropdown', 'value'),
+     State('overview-date-picker', 'start_date'),
+     State('overview-date-picker', 'end_date')])
+@telemetry.timed_callback('update_country')
+def update_country(country, graph_type, start_date, end_date):
+    # Everything depending on the country is rendered here from the dfs just loaded, rather than by
+    # a cascade of callbacks on the stores that would each decode them again.
+    prefetch.mark_requested(country)
+    try:
+        dfs = data.get_dfs(country)
+    except Exception:
+        # Keep showing the previous country.
+        return [dash.no_update] * 14 + [True, const.WARNING_MESSAGE.format(country=country.title())]
+
+    handles = [store.put(country, label, dfs[label]) for label in const.LABELS]
+    summary = data.get_summary_snapshot()
+    return ([country, handles]
+            + outputs_or_no_update(1, graph_figure, dfs, country, graph_type, None)
+            + outputs_or_no_update(5, overview, country, start_date, end_date, lambda: dfs)
+            + outputs_or_no_update(5, summary_table, summary, country)
+            + outputs_or_no_update(1, map_url, summary, country)
+            + [dash.no_update, dash.no_update])
+
+
+def outputs_or_no_update(count, function, *args):
+    """ Helper function to return the outputs of function as a list, or no_update for each if it fails """
+    try:
+        result = function(*args)
+    except Exception:
+        return [dash.no_update] * count
+    return list(result) if count > 1 else [result]
+
+
+def map_url(summary, country):
+    """Helper function to get the URL of the choropleth map of the country's continent"""
+    # The map only depends on the continent and the summary, countries of one continent share it.
+    return '/maps/{}/{}.json'.format(quote(graph_gen.map_scope(country)), store.data_version(summary))
+
+
+def map_figure(scope, summary):
+    """Helper function to get the choropleth map of a continent"""
+    version = store.data_version(summary)
+    figure = figure_cache.maps.get(scope, version)
+    if figure is None:
+        figure = graph_gen.get_map(scope, summary)
+        figure['data'] = [trace.to_plotly_json() for trace in figure['data']]
+        figure_cache.maps.put(scope, version, figure)
+    return figure
+
+
+@app.server.route('/maps/<scope>/<version>.json')
+def map_json(scope, version):
+    """Function serves a continent map, browsers keep it for as long as the summary version in the URL holds"""
+    summary = data.get_summary_snapshot()
+    if summary is None or scope not in set(const.CONTINENTS.values()) | {'world'}:
+        flask.abort(404)
+    response = app.server.response_class(json.dumps(map_figure(scope, summary), cls=plotly.utils.PlotlyJSONEncoder),
+                                         mimetype='application/json')
+    if version == store.data_version(summary):
+        response.cache_control.public = True
+        response.cache_control.max_age = const.MAP_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True  # An older version, the current map stands in.
+    return response
+
+
+# The map is fetched with a GET, unlike callback responses, so the browser cache and ETags apply.
+app.clientside_callback(
+    """
+    function(url) {
+        if (!url) {
+            return window.dash_clientside.no_update;
+        }
+        return fetch(url).then(function(response) {
+            return response.ok ? response.json() : window.dash_clientside.no_update;
+        });
+    }
+    """,
+    Output('map', 'figure'),
+    [Input('map-url', 'data')])
 
-    html.Div([
-        stat_selector
-    ]),
 
-    html.Div([
-        dcc.Graph(id='map', config=dict(scrollZoom=False, displaylogo=False, displayModeBar=False))
-    ]),
-])
+@app.callback(
+    [Output('total_cases_in_table', 'children', allow_duplicate=True),
+     Output('total_deaths_in_table', 'children', allow_duplicate=True),
+     Output('total_recovered_in_table', 'children', allow_duplicate=True),
+     Output('recovery_rate_in_table', 'children', allow_duplicate=True),
+     Output('death_rate_in_table', 'children', allow_duplicate=True),
+     Output('map-url', 'data', allow_duplicate=True)],
+    [Input('world-summary-version', 'data')],
+    [State('current-country', 'data')],
+    prevent_initial_call=True)
+@telemetry.timed_callback('update_summary')
+def update_summary(version, country):
+    # A summary arriving after the country was rendered (cold start or a background refresh).
+    summary = data.get_summary_snapshot()
+    if summary is None or not country:
+        raise PreventUpdate
+    return (outputs_or_no_update(5, summary_table, summary, country)
+            + outputs_or_no_update(1, map_url, summary, country))
 
 
 @app.callback(
-    Output('map', 'figure'),
-    [Input('current-country', 'data'),
-     Input('world-summary-data', 'data'),
-     Input('confirmed-data', 'data')])
-def create_map(country, summary, confirmed):
-    if confirmed:
-        return graph_gen.get_map(country, string_to_df(summary))
-    else:
+    Output('world-summary-version', 'data'),
+    [Input('summary-interval', 'n_intervals')],
+    [State('world-summary-version', 'data')])
+@telemetry.timed_callback('refresh_summary')
+def refresh_summary(_, version):
+    # Open pages pick up a summary refreshed in the background, or the first one after a cold start.
+    current_version = data.get_summary_version()
+    if current_version is None or current_version == version:
         raise PreventUpdate
+    return current_version
 
 
 @app.callback(
-    [Output('daily-cases', 'children'),
-     Output('daily-deaths', 'children'),
-     Output('daily-recovered', 'children'),
-     Output('overview-date-picker', 'min_date_allowed'),
-     Output('overview-date-picker', 'max_date_allowed')],
-    [Input('overview-date-picker', 'date'),
-     Input('confirmed-data', 'data'),
-     Input('recovered-data', 'data'),
-     Input('deaths-data', 'data')
-     ])
-def update_overview(date, confirmed, recovered, deaths):
+    [Output('daily-cases', 'children', allow_duplicate=True),
+     Output('daily-deaths', 'children', allow_duplicate=True),
+     Output('daily-recovered', 'children', allow_duplicate=True),
+     Output('overview-date-picker', 'min_date_allowed', allow_duplicate=True),
+     Output('overview-date-picker', 'max_date_allowed', allow_duplicate=True)],
+    [Input('overview-date-picker', 'start_date'),
+     Input('overview-date-picker', 'end_date')],
+    [State('data-handles', 'data'),
+     State('current-country', 'data')],
+    prevent_initial_call=True)
+@telemetry.timed_callback('update_overview')
+def update_overview(start_date, end_date, handles, country):
     try:
-        confirmed = string_to_df(confirmed)
-        recovered = string_to_df(recovered)
-        deaths = string_to_df(deaths)
-        maxDate = confirmed['Date'].max()
-        minDate = confirmed['Date'].min()
-
-        if date != None:
-            date = dt.strptime(date, '%Y-%m-%d').strftime('%Y-%m-%dT%H:%M:%SZ')
-            daily_cases = int(confirmed[confirmed['Date'] == date]['Daily'])
-            daily_deaths = int(deaths[deaths['Date'] == date]['Daily'])
-            daily_recovered = int(recovered[deaths['Date'] == date]['Daily'])
-            return "Daily Cases: {:,}".format(daily_cases), "Daily Deaths: {:,}".format(
-                daily_deaths), 'Daily Recovered: {:,}'.format(daily_recovered), minDate, maxDate
-        else:
-            return "Daily Cases: None", "Daily Cases: None", "Daily Recovered: None", minDate, maxDate
+        return overview(country, start_date, end_date, lambda: handles_to_dfs(handles))
     except Exception as e:
         raise PreventUpdate
 
 
-@app.callback([Output('total_cases_in_table', 'children'),
-               Output('total_deaths_in_table', 'children'),
-               Output('total_recovered_in_table', 'children'),
-               Output('recovery_rate_in_table', 'children'),
-               Output('death_rate_in_table', 'children')],
-              [Input('world-summary-data', 'data'),
-               Input('current-country', 'data')])
-def update_summary(summary, country):
-    try:
-        summary = string_to_df(summary)
-        total_confirmed = int(
-            summary[summary['Slug'] == country]['TotalConfirmed'])
-        total_recovered = int(
-            summary[summary['Slug'] == country]['TotalRecovered'])
-        total_deaths = int(summary[summary['Slug'] == country]['TotalDeaths'])
-        recovery_rate = total_recovered / total_confirmed
-        death_rate = total_deaths / total_confirmed
-
-        return 'Total Confirmed: {:,}'.format(total_confirmed), 'Total Recovered: {:,}'.format(
-            total_recovered), 'Total Deaths: {:,}'.format(total_deaths), 'Recovery Rate: {:.2%}'.format(
-            recovery_rate), 'Death Rate: {:.2%}'.format(death_rate)
-    except:
-        raise PreventUpdate
+def overview(country, start_date, end_date, load_dfs):
+    """Helper function to compute the overview texts and date bounds, load_dfs is only called without the cube"""
+    if cube.has(country):
+        # Constant-time lookups in the prefix sums of the cube.
+        minDate, maxDate = cube.date_range(country)
+        range_total = lambda label: cube.range_total(country, start_date, end_date, label)
+    else:
+        dfs = load_dfs()
+        minDate = dfs['confirmed']['Date'].min()
+        maxDate = dfs['confirmed']['Date'].max()
+        range_total = lambda label: data.range_total(dfs[label], start_date, end_date)
+
+    if start_date != None and end_date != None:
+        return overview_text('Cases', *range_total('confirmed')), overview_text(
+            'Deaths', *range_total('deaths')), overview_text('Recovered', *range_total('recovered')), minDate, maxDate
+    else:
+        return "Cases: None", "Deaths: None", "Recovered: None", minDate, maxDate
 
 
-def string_to_df(string):
-    """ Helper function to convert a string to a df"""
-    if isinstance(string, str):
-        return pd.DataFrame(ast.literal_eval(string))
+def overview_text(name, total, days):
+    """Helper function to format the total and daily average of a date range"""
+    if days == 0:
+        return '{}: None'.format(name)
+    return '{}: {:,} ({:,.0f} per day)'.format(name, total, total / days)
 
 
-@app.callback(
-    [Output('confirmed-data', 'data'),
-     Output('recovered-data', 'data'),
-     Output('deaths-data', 'data'),
-     Output('current-country', 'data')],
-    [Input('countries-dropdown', 'value')])
-def update_data(country):
-    try:
-        confirmed, recovered, deaths = data.get_data(country)
-        return confirmed, recovered, deaths, country
-    except:
+def summary_table(summary, country):
+    """Helper function to format the totals and rates of the country from the summary df"""
+    row = summary[summary['Slug'] == country].iloc[0]
+    total_confirmed = int(row['TotalConfirmed'])
+    total_recovered = int(row['TotalRecovered'])
+    total_deaths = int(row['TotalDeaths'])
+    recovery_rate = total_recovered / total_confirmed
+    death_rate = total_deaths / total_confirmed
+
+    return 'Total Confirmed: {:,}'.format(total_confirmed), 'Total Recovered: {:,}'.format(
+        total_recovered), 'Total Deaths: {:,}'.format(total_deaths), 'Recovery Rate: {:.2%}'.format(
+        recovery_rate), 'Death Rate: {:.2%}'.format(death_rate)
+
+
+def handles_to_dfs(handles):
+    """ Helper function to resolve the data-handles store to a dict label -> df"""
+    if not handles:
         raise PreventUpdate
+    return {handle['label']: data.resolve(handle) for handle in handles}
 
 
-@app.callback(Output('main-graph', 'figure'),
-              [Input('confirmed-data', 'data'),
-               Input('recovered-data', 'data'),
-               Input('deaths-data', 'data'),
-               Input('current-country', 'data'),
-               Input('graphs-dropdown', 'value')])
-def update_graph(confirmed, recovered, deaths, country, graph_type):
+@app.callback(Output('main-graph', 'figure', allow_duplicate=True),
+              [Input('graphs-dropdown', 'value'),
+               Input('main-graph', 'relayoutData')],
+              [State('data-handles', 'data'),
+               State('current-country', 'data')],
+              prevent_initial_call=True)
+@telemetry.timed_callback('update_graph')
+def update_graph(graph_type, relayout, handles, country):
     try:
-        confirmed = string_to_df(confirmed)
-        recovered = string_to_df(recovered)
-        deaths = string_to_df(deaths)
-
-        current_figure = None
-        if graph_type == const.GRAPH_TYPE.SCATTER_TOTAL_CASES:
-            data = {'confirmed': confirmed,
-                    'recovered': recovered, 'deaths': deaths}
-            current_figure = dict(
-                data=graph_gen.tracer(
-                    const.GRAPH_TYPE.SCATTER_TOTAL_CASES, data),
-                layout=graph_gen.generic_layout_generator(
-                    const.GRAPH_TYPE.SCATTER_TOTAL_CASES, country, True)
-            )
-        elif graph_type == const.GRAPH_TYPE.BAR_DAILY_CONFIRMED:
-            current_figure = dict(
-                data=graph_gen.tracer(
-                    const.GRAPH_TYPE.BAR_DAILY_CONFIRMED, confirmed),
-                layout=graph_gen.generic_layout_generator(
-                    const.GRAPH_TYPE.BAR_DAILY_CONFIRMED, country, True)
-            )
-        elif graph_type == const.GRAPH_TYPE.BAR_DAILY_RECOVERED:
-            current_figure = dict(
-                data=graph_gen.tracer(
-                    const.GRAPH_TYPE.BAR_DAILY_RECOVERED, recovered),
-                layout=graph_gen.generic_layout_generator(
-                    const.GRAPH_TYPE.BAR_DAILY_RECOVERED, country, True)
-            )
-        elif graph_type == const.GRAPH_TYPE.BAR_DAILY_DEATHS:
-            current_figure = dict(
-                data=graph_gen.tracer(
-                    const.GRAPH_TYPE.BAR_DAILY_DEATHS, deaths),
-                layout=graph_gen.generic_layout_generator(
-                    const.GRAPH_TYPE.BAR_DAILY_DEATHS, country, True)
-            )
-        elif graph_type == const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED:
-            data = {'confirmed': confirmed,
-                    'recovered': recovered, 'deaths': deaths}
-            current_figure = dict(
-                data=graph_gen.tracer(
-                    const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED, data),
-                layout=graph_gen.generic_layout_generator(const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED, country,
-                                                          True)
-            )
-        return current_figure
+        # Zooming (or a rangeselector button) re-sends the visible range at a finer resolution.
+        x_range = None
+        if [trigger['prop_id'] for trigger in dash.callback_context.triggered] == ['main-graph.relayoutData']:
+            x_range = pyramid.visible_range(relayout)
+            if x_range is None and not pyramid.is_reset(relayout):
+                raise PreventUpdate
+
+        return graph_figure(handles_to_dfs(handles), country, graph_type, x_range)
     except Exception as e:
         raise PreventUpdate
 
 
-@app.callback(
-    [Output("alert", "is_open"),
-     Output('alert', 'children')],
-    [Input("countries-dropdown", 'value'),
-     Input('current-country', 'data')],
-)
-def toggle_alert(country, current_country):
-    if country != current_country:
-        return True, const.WARNING_MESSAGE.format(country=country.title())
-    else:
+def graph_figure(dfs, country, graph_type, x_range):
+    """Helper function to build the main graph figure, for the visible x_range or the whole series if None"""
+    confirmed, recovered, deaths = dfs['confirmed'], dfs['recovered'], dfs['deaths']
+
+    # Switching back to a graph already rendered from the same data is a cache read.
+    version = tuple(store.data_version(df) for df in (confirmed, recovered, deaths))
+    if x_range is None:
+        current_figure = figure_cache.graphs.get((country, graph_type), version)
+        if current_figure is not None:
+            return current_figure
+
+    if graph_type == const.GRAPH_TYPE.SCATTER_TOTAL_CASES:
+        data = {'confirmed': confirmed,
+                'recovered': recovered, 'deaths': deaths}
+        current_figure = dict(
+            data=graph_gen.tracer(
+                const.GRAPH_TYPE.SCATTER_TOTAL_CASES, data),
+            layout=graph_gen.generic_layout_generator(
+                const.GRAPH_TYPE.SCATTER_TOTAL_CASES, country, True)
+        )
+    elif graph_type == const.GRAPH_TYPE.BAR_DAILY_CONFIRMED:
+        current_figure = dict(
+            data=graph_gen.tracer(
+                const.GRAPH_TYPE.BAR_DAILY_CONFIRMED, confirmed),
+            layout=graph_gen.generic_layout_generator(
+                const.GRAPH_TYPE.BAR_DAILY_CONFIRMED, country, True)
+        )
+    elif graph_type == const.GRAPH_TYPE.BAR_DAILY_RECOVERED:
+        current_figure = dict(
+            data=graph_gen.tracer(
+                const.GRAPH_TYPE.BAR_DAILY_RECOVERED, recovered),
+            layout=graph_gen.generic_layout_generator(
+                const.GRAPH_TYPE.BAR_DAILY_RECOVERED, country, True)
+        )
+    elif graph_type == const.GRAPH_TYPE.BAR_DAILY_DEATHS:
+        current_figure = dict(
+            data=graph_gen.tracer(
+                const.GRAPH_TYPE.BAR_DAILY_DEATHS, deaths),
+            layout=graph_gen.generic_layout_generator(
+                const.GRAPH_TYPE.BAR_DAILY_DEATHS, country, True)
+        )
+    elif graph_type == const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED:
+        data = {'confirmed': confirmed,
+                'recovered': recovered, 'deaths': deaths}
+        current_figure = dict(
+            data=graph_gen.tracer(
+                const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED, data),
+            layout=graph_gen.generic_layout_generator(const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED, country,
+                                                      True)
+        )
+    elif graph_type in const.METRIC_GRAPH_TYPES:
+        data = {'confirmed': confirmed,
+                'recovered': recovered, 'deaths': deaths}
+        current_figure = dict(
+            data=graph_gen.tracer(graph_type, data, country),
+            layout=graph_gen.generic_layout_generator(graph_type, country, True)
+        )
+    if current_figure is not None:
+        current_figure['data'] = pyramid.reduce_traces([trace.to_plotly_json() for trace in current_figure['data']],
+                                                       x_range)
+        # Keeps the user's zoom when the figure is swapped for a finer one.
+        current_figure['layout']['uirevision'] = '{}-{}'.format(country, graph_type)
+        if x_range is None:
+            figure_cache.graphs.put((country, graph_type), version, current_figure)
+    return current_figure
+
+
+@app.callback(Output('comparison-graph', 'figure'),
+              [Input('compare-dropdown', 'value'),
+               Input('compare-alignment', 'value'),
+               Input('compare-options', 'value')])
+@telemetry.timed_callback('update_comparison')
+def update_comparison(slugs, label, options):
+    try:
+        slugs = (slugs or [])[:const.COMPARE_MAX]
+        per_capita = 'per-capita' in (options or [])
+        aligned, found = alignment.compare(slugs, label, per_capita)
+        return graph_gen.get_comparison(slugs, aligned, found, label, per_capita)
+    except Exception as e:
         raise PreventUpdate
 
 
 if __name__ == '__main__':
+    if const.PREFETCH_ENABLED:
+        prefetch.start()
     app.run_server(debug=True)
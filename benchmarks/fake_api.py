@@ -0,0 +1,86 @@
+"""Local stand-in for the covid19api endpoints used by data.py, serving benchmarks/fixtures.py data.
+
+Latency, server errors and rate limiting can be injected to see how the dashboard behaves under load.
+Point the dashboard at it with COVID_API_URL=http://127.0.0.1:8765
+
+Usage: python benchmarks/fake_api.py [--port 8765] [--days 500] [--latency-ms 200] [--error-rate 0.01]
+                                     [--rate-limit-rate 0.05]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+
+import flask
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fixtures  # noqa: E402
+
+server = flask.Flask(__name__)
+settings = argparse.Namespace(days=500, latency_ms=0.0, error_rate=0.0, rate_limit_rate=0.0)
+
+
+@lru_cache(maxsize=None)
+def __dayone(label, days):
+    return flask.json.dumps(fixtures.dayone_response(label, days))
+
+
+@lru_cache(maxsize=None)
+def __all(days):
+    return flask.json.dumps(fixtures.all_response(days))
+
+
+@lru_cache(maxsize=None)
+def __summary():
+    return flask.json.dumps(fixtures.summary_response())
+
+
+@server.before_request
+def inject_faults():
+    if settings.latency_ms:
+        # Uniform jitter of +/-50% around the configured latency.
+        time.sleep(settings.latency_ms * random.uniform(0.5, 1.5) / 1000)
+    roll = random.random()
+    if roll < settings.rate_limit_rate:
+        return flask.Response('{"message": "Too Many Requests"}', status=429, headers={'Retry-After': '1'},
+                              mimetype='application/json')
+    if roll < settings.rate_limit_rate + settings.error_rate:
+        return flask.Response('{"message": "Internal Server Error"}', status=500, mimetype='application/json')
+
+
+@server.route('/total/dayone/country/<country>/status/<label>')
+def total_dayone(country, label):
+    if label not in ('confirmed', 'recovered', 'deaths'):
+        flask.abort(404)
+    return flask.Response(__dayone(label, settings.days), mimetype='application/json')
+
+
+@server.route('/summary')
+def summary():
+    return flask.Response(__summary(), mimetype='application/json')
+
+
+@server.route('/all')
+def all_data():
+    return flask.Response(__all(settings.days), mimetype='application/json')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--days', type=int, default=settings.days, help='history length of every series')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='mean added latency per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0,
+                        help='fraction of requests answered with 429')
+    args = parser.parse_args()
+    for name in ('days', 'latency_ms', 'error_rate', 'rate_limit_rate'):
+        setattr(settings, name, getattr(args, name))
+    server.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Offline covid19api responses for the benchmarks.
+
+Responses recorded with `python benchmarks/fixtures.py --record` are saved in benchmarks/fixtures/
+and used when present. Longer histories than the recording (or no recording at all) are synthesized
+in the same shape as the API's responses.
+"""
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import constants as const  # noqa: E402
+import countries  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RECORD_COUNTRY = 'united-states'
+API_DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def sources(days):
+    """Function returns, per response the benchmarks use, whether it is 'recorded' or 'synthesized' at `days`"""
+    result = {}
+    for label in const.LABELS:
+        recorded = __load('dayone_{}.json'.format(label)) or []
+        result['dayone_{}'.format(label)] = 'recorded' if len(recorded) >= days else 'synthesized'
+    result['summary'] = 'synthesized' if __load('summary.json') is None else 'recorded'
+    return result
+
+
+def dayone_response(label, days):
+    """Function returns a /total/dayone/country/{country}/status/{label} response with `days` records"""
+    recorded = __load('dayone_{}.json'.format(label)) or []
+    if len(recorded) >= days:
+        return recorded[:days]
+
+    first = datetime(2020, 1, 22)
+    growth = {'confirmed': 997, 'recovered': 613, 'deaths': 31}[label]
+    records = []
+    cases = 0
+    for day in range(days):
+        cases += (day * growth) % 7919
+        records.append(dict(Country='United States of America', CountryCode='US', Province='', City='',
+                            CityCode='', Lat='0', Lon='0', Cases=cases, Status=label,
+                            Date=(first + timedelta(days=day)).strftime(API_DATE_FORMAT)))
+    return records
+
+
+def summary_response():
+    """Function returns a /summary response"""
+    recorded = __load('summary.json')
+    if recorded is not None:
+        return recorded
+
+    rows = []
+    for i, country in enumerate(country for country in countries.registry() if country.slug):
+        confirmed = (i + 1) * 104729 % 9999991
+        rows.append(dict(Country=country.label, CountryCode=country.iso2, Slug=country.slug, NewConfirmed=0,
+                         TotalConfirmed=confirmed, NewDeaths=0, TotalDeaths=confirmed // 50, NewRecovered=0,
+                         TotalRecovered=confirmed // 2, Date='2020-06-01T00:00:00Z'))
+    return dict(Global={}, Countries=rows, Date='2020-06-01T00:00:00Z')
+
+
+def all_response(days):
+    """Function returns an /all response with `days` records for every country"""
+    first = datetime(2020, 1, 22)
+    dates = [(first + timedelta(days=day)).strftime(API_DATE_FORMAT) for day in range(days)]
+    records = []
+    for i, country in enumerate(country for country in countries.registry() if country.slug):
+        confirmed = 0
+        for day, date in enumerate(dates):
+            confirmed += (day * (i + 1) * 7) % 1009
+            records.append(dict(Country=country.label, CountryCode=country.iso2, Province='', City='',
+                                CityCode='', Lat='0', Lon='0', Confirmed=confirmed, Deaths=confirmed // 50,
+                                Recovered=confirmed // 2, Active=confirmed - confirmed // 2 - confirmed // 50,
+                                Date=date))
+    return records
+
+
+def record():
+    """Function saves the real API responses used by the benchmarks"""
+    import requests
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    url = const.API_URL + '/total/dayone/country/{country}/status/{label}'
+    responses = {'summary.json': const.API_URL + '/summary'}
+    for label in const.LABELS:
+        responses['dayone_{}.json'.format(label)] = url.format(country=RECORD_COUNTRY, label=label)
+    for name, url in responses.items():
+        response = requests.get(url, timeout=const.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        with open(os.path.join(FIXTURE_DIR, name), 'w') as f:
+            json.dump(response.json(), f)
+
+
+def __load(name):
+    try:
+        with open(os.path.join(FIXTURE_DIR, name)) as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+
+if __name__ == '__main__' and '--record' in sys.argv:
+    record()
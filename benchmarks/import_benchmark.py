@@ -0,0 +1,48 @@
+"""Cold-start benchmark: import time of the dashboard modules in fresh interpreters.
+
+Each module is imported RUNS times in a new process and the median wall time is reported,
+along with the self time of the repo's own modules from `python -X importtime`.
+
+Usage: python benchmarks/import_benchmark.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ['app', 'data', 'graph_generator']
+RUNS = 5
+
+TIMER = 'import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)'
+
+
+def import_seconds(module):
+    output = subprocess.run([sys.executable, '-c', TIMER.format(module=module)], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return float(output.split()[-1])
+
+
+def repo_self_times(module):
+    """Function returns the self import time in microseconds of every repo module imported by module"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stderr
+    repo_modules = {name[:-3] for name in os.listdir(ROOT) if name.endswith('.py')}
+    times = {}
+    for line in stderr.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] in repo_modules:
+            times[parts[2]] = int(parts[0].split(':')[-1])
+    return times
+
+
+def main():
+    for module in MODULES:
+        median = statistics.median(import_seconds(module) for _ in range(RUNS))
+        print('{:<16} {:>8.1f} ms'.format(module, median * 1000))
+        for name, self_us in sorted(repo_self_times(module).items(), key=lambda item: -item[1]):
+            print('    {:<16} {:>8.2f} ms self'.format(name, self_us / 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Multi-user load test against a running dashboard.
+
+Simulated users post Dash callback requests the way the browser does: every action (country
+change, graph switch, date pick, comparison) sets a property and the callbacks depending on it
+are run, cascading through their outputs. Clientside callbacks run in the browser, the one reaching
+the server is the map's GET, which like the browser cache is only sent once per URL. Latency
+percentiles and throughput are reported per callback.
+
+Usage: python benchmarks/load_test.py [--url http://127.0.0.1:8050] [--users 20] [--duration 60]
+Run the dashboard against benchmarks/fake_api.py (COVID_API_URL) to keep the real API out of it.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import constants as const  # noqa: E402
+import countries  # noqa: E402
+
+# First output id -> callback name in app.py.
+CALLBACK_NAMES = {'current-country': 'update_country', 'main-graph': 'update_graph', 'daily-cases': 'update_overview',
+                  'comparison-graph': 'update_comparison', 'total_cases_in_table': 'update_summary',
+                  'world-summary-version': 'refresh_summary'}
+ACTIONS = [('country', 0.3), ('graph', 0.4), ('date', 0.2), ('compare', 0.1)]
+
+
+def parse_outputs(output):
+    """Function splits a Dash output key ('a.b' or '..a.b...c.d..') into (id, property) pairs"""
+    if output.startswith('..'):
+        output = output[2:-2]
+        return [tuple(part.rsplit('.', 1)) for part in output.split('...')]
+    return [tuple(output.rsplit('.', 1))]
+
+
+def initial_props(layout):
+    """Function collects the (id, property) -> value pairs set in the served layout"""
+    props = {}
+    stack = [layout]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict) and 'props' in node:
+            component_id = node['props'].get('id')
+            for name, value in node['props'].items():
+                if name == 'children':
+                    stack.append(value)
+                elif component_id is not None:
+                    props[(component_id, name)] = value
+    return props
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def add(self, name, seconds, ok):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+
+
+class User:
+    def __init__(self, url, dependencies, layout, recorder):
+        self.url = url
+        self.dependencies = dependencies
+        self.props = initial_props(layout)
+        self.recorder = recorder
+        self.session = requests.Session()
+        self.cached_maps = set()  # Map URLs are versioned and served immutable.
+
+    def set_props(self, changes):
+        """Function applies the changes and runs every callback depending on them, like the Dash renderer"""
+        changed = list(changes)
+        self.props.update(changes)
+        while changed:
+            triggered = set(changed)
+            changed = []
+            for callback in self.dependencies:
+                inputs = [(item['id'], item['property']) for item in callback['inputs']]
+                if not triggered.intersection(inputs):
+                    continue
+                if callback.get('clientside_function'):
+                    changed += self.fetch_map()
+                else:
+                    changed += self.call(callback, [prop for prop in inputs if prop in triggered])
+
+    def fetch_map(self):
+        """Function GETs the map of the current map-url like the clientside callback, unless it is cached"""
+        url = self.props.get(('map-url', 'data'))
+        if not url or url in self.cached_maps:
+            return []
+        started = time.perf_counter()
+        try:
+            response = self.session.get(self.url + url, timeout=60)
+            ok = response.status_code == 200
+        except requests.RequestException:
+            response, ok = None, False
+        self.recorder.add('get_map', time.perf_counter() - started, ok)
+        if not ok:
+            return []
+        self.cached_maps.add(url)
+        self.props[('map', 'figure')] = response.json()
+        return [('map', 'figure')]
+
+    def call(self, callback, changed_props):
+        outputs = parse_outputs(callback['output'])
+        body = dict(
+            output=callback['output'],
+            outputs=[dict(id=i, property=p) for i, p in outputs] if callback['output'].startswith('..') else
+            dict(id=outputs[0][0], property=outputs[0][1]),
+            inputs=[dict(item, value=self.props.get((item['id'], item['property']))) for item in callback['inputs']],
+            state=[dict(item, value=self.props.get((item['id'], item['property']))) for item in callback['state']],
+            changedPropIds=['{}.{}'.format(i, p) for i, p in changed_props],
+        )
+        name = CALLBACK_NAMES.get(outputs[0][0], callback['output'])
+        started = time.perf_counter()
+        try:
+            response = self.session.post(self.url + '/_dash-update-component', json=body, timeout=60)
+            ok = response.status_code in (200, 204)
+        except requests.RequestException:
+            response, ok = None, False
+        self.recorder.add(name, time.perf_counter() - started, ok)
+        if not ok or response.status_code == 204:
+            return []
+
+        updates = {}
+        for component_id, values in response.json().get('response', {}).items():
+            for prop, value in values.items():
+                updates[(component_id, prop)] = value
+        self.props.update(updates)
+        return list(updates)
+
+    def run(self, deadline, slugs):
+        self.set_props({('countries-dropdown', 'value'): random.choice(slugs),
+                        ('graphs-dropdown', 'value'): const.GRAPH_TYPE.SCATTER_TOTAL_CASES})
+        while time.time() < deadline:
+            action = random.choices([a for a, _ in ACTIONS], weights=[w for _, w in ACTIONS])[0]
+            if action == 'country':
+                self.set_props({('countries-dropdown', 'value'): random.choice(slugs)})
+            elif action == 'compare':
+                compared = random.sample(slugs, random.randint(1, min(len(slugs), const.COMPARE_MAX)))
+                self.set_props({('compare-dropdown', 'value'): compared,
+                                ('compare-alignment', 'value'): random.choice(list(const.ALIGNMENTS))})
+            elif action == 'graph':
+                graph_type = random.choice(const.GRAPH_DROPDOWN_OPTIONS)['value']
+                self.set_props({('graphs-dropdown', 'value'): graph_type})
+            else:
+                start = self.props.get(('overview-date-picker', 'min_date_allowed'))
+                end = self.props.get(('overview-date-picker', 'max_date_allowed'))
+                if start and end:
+                    self.set_props({('overview-date-picker', 'start_date'): start[:10],
+                                    ('overview-date-picker', 'end_date'): end[:10]})
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def report(recorder, seconds):
+    row = '{:<18} {:>8} {:>8} {:>9} {:>9} {:>9} {:>9}'
+    print(row.format('callback', 'calls', 'errors', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms'))
+    total = 0
+    for name, latencies in sorted(recorder.latencies.items()):
+        total += len(latencies)
+        print(row.format(name, len(latencies), recorder.errors[name], '{:.1f}'.format(len(latencies) / seconds),
+                         *['{:.1f}'.format(percentile(latencies, q) * 1000) for q in (0.5, 0.95, 0.99)]))
+    print('total: {} requests in {:.1f}s, {:.1f} req/s'.format(total, seconds, total / seconds))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:8050')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=60, help='seconds')
+    parser.add_argument('--countries', type=int, default=0,
+                        help='only pick among the first N countries (0 for all), to model hot countries')
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/')
+    dependencies = requests.get(url + '/_dash-dependencies', timeout=30).json()
+    layout = requests.get(url + '/_dash-layout', timeout=30).json()
+    slugs = countries.slugs()[:args.countries or None]
+
+    recorder = Recorder()
+    started = time.time()
+    deadline = started + args.duration
+    threads = [threading.Thread(target=User(url, dependencies, layout, recorder).run, args=(deadline, slugs))
+               for _ in range(args.users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report(recorder, time.time() - started)
+
+
+if __name__ == '__main__':
+    main()
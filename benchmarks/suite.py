@@ -0,0 +1,154 @@
+"""Benchmark suite for the data and figure hot paths, run offline against benchmarks/fixtures.py.
+
+Every case runs at each history length and the results are saved as JSON, together with whether
+the fixtures of each length were recorded or synthesized. Pass a previous result with --compare to
+print the ratio against it.
+
+Usage: python benchmarks/suite.py [--output results.json] [--compare old.json] [--lengths 100,1000]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep the benchmarks away from the real cache, bulk store and cube.
+__scratch = tempfile.mkdtemp(prefix='covid-bench-')
+os.environ['COVID_CACHE_DIR'] = os.path.join(__scratch, 'cache')
+os.environ['COVID_BULK_STORE_DIR'] = os.path.join(__scratch, 'bulk_store')
+# Figures must be rebuilt on every run, not read back from the cross-worker store.
+os.environ['COVID_SHARED_FIGURE_CACHE'] = '0'
+
+import app  # noqa: E402
+import constants as const  # noqa: E402
+import data  # noqa: E402
+import figure_cache  # noqa: E402
+import store  # noqa: E402
+import graph_generator as graph_gen  # noqa: E402
+import alignment  # noqa: E402
+import countries  # noqa: E402
+import fixtures  # noqa: E402
+
+HISTORY_LENGTHS = [100, 1000, 10000]
+COUNTRY = fixtures.RECORD_COUNTRY
+REPEAT = 5
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def fake_get(days):
+    """Function returns a stand-in for session.get serving the fixtures"""
+    def get(url, timeout=None):
+        if url.endswith('/summary'):
+            return FakeResponse(fixtures.summary_response())
+        return FakeResponse(fixtures.dayone_response(url.rsplit('/', 1)[-1], days))
+    return get
+
+
+def cases(days):
+    """Function returns the (name, callable) pairs timed for one history length"""
+    fetch_daily = getattr(data, '__fetch_total_daily_df')
+    fetch_summary = getattr(data, '__fetch_summary_df')
+    payloads = [data.encode_df(fetch_daily(COUNTRY, label)) for label in const.LABELS]
+    dfs = {label: data.decode_df(payload) for label, payload in zip(const.LABELS, payloads)}
+    handles = [store.put(COUNTRY, label, dfs[label]) for label in const.LABELS]
+    summary_payload = data.encode_df(fetch_summary())
+    summary_df = data.decode_df(summary_payload)
+    dates = dfs['confirmed']['Date']
+    start_date, end_date = dates.iloc[0][:10], dates.iloc[-1][:10]
+
+    def update_graph(graph_type):
+        def run():
+            figure_cache.graphs.clear()
+            app.graph_figure(dfs, COUNTRY, graph_type, None)
+        return run
+
+    def get_map():
+        figure_cache.maps.clear()
+        graph_gen.get_map(graph_gen.map_scope(COUNTRY), summary_df)
+
+    result = [
+        ('get_total_daily_df', lambda: fetch_daily(COUNTRY, 'confirmed')),
+        ('get_summary', lambda: data.encode_df(fetch_summary())),
+        ('decode_df', lambda: data.decode_df(payloads[0])),
+    ]
+    for name, graph_type in sorted(vars(const.GRAPH_TYPE).items(), key=lambda item: str(item[1])):
+        if not name.startswith('_'):
+            result.append(('update_graph[{}]'.format(name), update_graph(graph_type)))
+    result += [
+        ('update_overview', lambda: app.update_overview(start_date, end_date, handles, COUNTRY)),
+        ('update_summary', lambda: app.summary_table(summary_df, COUNTRY)),
+        ('get_map', get_map),
+        ('compare[20]', lambda: alignment.compare(countries.slugs()[:20], 'confirmed', True)),
+    ]
+    return result
+
+
+def run(lengths):
+    results = {}
+    for days in lengths:
+        # Cases going through the on-disk cache (compare) must not read the series of the previous length.
+        for directory in (const.CACHE_DIR, const.BULK_STORE_DIR):
+            shutil.rmtree(directory, ignore_errors=True)
+        with mock.patch.object(data.session, 'get', fake_get(days)):
+            for name, case in cases(days):
+                number = max(1, 2000 // days)
+                timings = [t / number * 1000 for t in timeit.repeat(case, number=number, repeat=REPEAT)]
+                key = '{}@{}'.format(name, days)
+                results[key] = dict(min_ms=min(timings), median_ms=statistics.median(timings))
+                print('{:<56} {:>10.3f} ms'.format(key, results[key]['min_ms']))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results',
+                                                         'bench-{}.json'.format(time.strftime('%Y%m%d-%H%M%S'))))
+    parser.add_argument('--compare')
+    parser.add_argument('--lengths', default=','.join(map(str, HISTORY_LENGTHS)))
+    args = parser.parse_args()
+
+    lengths = [int(days) for days in args.lengths.split(',')]
+    results = run(lengths)
+    # Recorded responses only cover the recorded history, longer lengths are synthesized.
+    sources = {days: fixtures.sources(days) for days in lengths}
+    for days, source in sources.items():
+        print('fixtures@{}: {}'.format(days, ', '.join('{}={}'.format(*item) for item in sorted(source.items()))))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(dict(python=platform.python_version(), machine=platform.machine(), fixtures=sources,
+                       results=results), f, indent=2)
+    print('Saved to {}'.format(args.output))
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)['results']
+        print('\n{:<52} {:>10}'.format('case', 'new / old'))
+        for key, result in results.items():
+            if key in previous:
+                print('{:<56} {:>10.2f}'.format(key, result['min_ms'] / previous[key]['min_ms']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark for the dcc.Store transport format.
+
+Compares the old df.to_json() + ast.literal_eval round trip against
+data.encode_df / data.decode_df for increasingly long histories.
+
+Usage: python benchmarks/transport_benchmark.py
+"""
+import ast
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import data  # noqa: E402
+
+HISTORY_LENGTHS = [100, 1000, 10000]
+REPEAT = 5
+
+
+def make_history(days):
+    """Function builds a synthetic daily df shaped like get_total_daily_df's output"""
+    dates = pd.date_range('2020-01-22', periods=days, freq='D').strftime('%Y-%m-%dT%H:%M:%SZ')
+    cases = np.cumsum(np.random.randint(0, 5000, size=days))
+    df = pd.DataFrame({'Cases': cases, 'Date': dates})
+    df['Daily'] = df['Cases'] - df['Cases'].shift()
+    df['Daily'] = df['Daily'].apply(abs)
+    df.fillna(value=0, inplace=True)
+    return df
+
+
+def best_of(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=REPEAT)) / number * 1000
+
+
+def main():
+    row = '{:>7} | {:<11} | {:>10} | {:>10} | {:>12}'
+    print(row.format('days', 'format', 'encode ms', 'decode ms', 'bytes'))
+    for days in HISTORY_LENGTHS:
+        df = make_history(days)
+        number = max(1, 10000 // days)
+
+        old_payload = df.to_json()
+        old_encode = best_of(lambda: df.to_json(), number)
+        old_decode = best_of(lambda: pd.DataFrame(ast.literal_eval(old_payload)), number)
+        print(row.format(days, 'json+eval', '{:.3f}'.format(old_encode), '{:.3f}'.format(old_decode),
+                         len(old_payload)))
+
+        # Dash serializes the store payload to JSON on the way to the browser and back.
+        new_payload = json.dumps(data.encode_df(df))
+        new_encode = best_of(lambda: json.dumps(data.encode_df(df)), number)
+        new_decode = best_of(lambda: data.decode_df(json.loads(new_payload)), number)
+        print(row.format(days, 'columnar', '{:.3f}'.format(new_encode), '{:.3f}'.format(new_decode),
+                         len(new_payload)))
+
+
+if __name__ == '__main__':
+    main()
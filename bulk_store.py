@@ -0,0 +1,76 @@
+"""Local columnar store with every country's history, filled in one pass from the /all endpoint.
+
+Run `python bulk_store.py` (e.g. from cron) to refresh it. Each country is written to
+BULK_STORE_DIR/<slug>.npz holding a `date` array and one int array per label, and the
+whole world is written to the memory-mapped cube (see cube.py).
+"""
+import os
+import threading
+import numpy as np
+import pandas as pd
+import constants as const
+import countries
+import cube
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def ingest(all_df):
+    """Function writes a long df (CountryCode, Date, Confirmed, Recovered, Deaths) partitioned by country"""
+    os.makedirs(const.BULK_STORE_DIR, exist_ok=True)
+    columns = [label.title() for label in const.LABELS]
+    written = 0
+    for iso2, country_df in all_df.groupby('CountryCode', sort=False):
+        # The /all endpoint only reports country codes.
+        slug = countries.iso2_to_slug().get(iso2)
+        if slug is None:
+            continue
+        country_df = country_df.sort_values('Date')
+        values = country_df[columns].to_numpy(dtype=np.int64)
+
+        # Same as the /total/dayone endpoint: the history starts at the first confirmed case.
+        first_day = np.argmax(values[:, 0] > 0)
+        if values[first_day, 0] == 0:
+            continue
+        arrays = {label: values[first_day:, i] for i, label in enumerate(const.LABELS)}
+        dates = pd.to_datetime(country_df['Date'], utc=True).dt.tz_localize(None)
+        arrays['date'] = dates.to_numpy().astype('datetime64[D]')[first_day:]
+        __write(slug, arrays)
+        written += 1
+    cube.build(all_df)
+    return written
+
+
+def read(country, label):
+    """Function returns the daily df for a country from the store, or None if it was never ingested"""
+    try:
+        with np.load(__path(country)) as arrays:
+            cases = arrays[label]
+            dates = arrays['date']
+    except (OSError, KeyError, ValueError):
+        return None
+    df = pd.DataFrame({'Cases': cases, 'Date': pd.DatetimeIndex(dates).strftime(DATE_FORMAT)})
+    df['Daily'] = np.abs(np.diff(cases, prepend=cases[:1]))
+    return df
+
+
+def has(country):
+    return os.path.exists(__path(country))
+
+
+def __path(country):
+    return os.path.join(const.BULK_STORE_DIR, '{country}.npz'.format(country=country))
+
+
+def __write(country, arrays):
+    path = __path(country)
+    tmp_path = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+if __name__ == '__main__':
+    import data
+
+    print('Countries written: {}'.format(ingest(data.get_all_data())))
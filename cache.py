@@ -0,0 +1,105 @@
+import os
+import time
+import threading
+import pandas as pd
+import constants as const
+import singleflight
+
+# Lookups served fresh, served stale or fetched.
+__stats = dict(hits=0, stale_hits=0, misses=0)
+__stats_lock = threading.Lock()
+
+# Keys currently being refreshed in the background.
+__refreshing = set()
+__refreshing_lock = threading.Lock()
+
+
+def get(country, label, fetch):
+    """Function returns the series for (country, label), serving a stale copy while it is refreshed"""
+    df, age = read(country, label)
+    if df is None:
+        __count('misses')
+        df = load(country, label, fetch)
+    elif age > const.CACHE_TTL:
+        __count('stale_hits')
+        refresh_in_background(country, label, fetch)
+    else:
+        __count('hits')
+    return df
+
+
+def load(country, label, fetch, max_age=const.CACHE_TTL):
+    """Function fetches (country, label) into the cache, concurrent callers in every worker process share one fetch.
+    A copy younger than max_age, written by a fetch that just finished, is returned instead"""
+    def fresh():
+        df, age = read(country, label)
+        return df if df is not None and age <= max_age else None
+
+    def fetch_and_write():
+        df = fetch(country, label)
+        write(country, label, df)
+        return df
+
+    return singleflight.do((country, label), fetch_and_write, fresh)
+
+
+def stats():
+    with __stats_lock:
+        return dict(__stats)
+
+
+def read(country, label):
+    """Function returns the cached df and its age in seconds, or (None, None) if not cached"""
+    path = __path(country, label)
+    try:
+        age = time.time() - os.path.getmtime(path)
+        df = pd.read_json(path, orient='split', convert_dates=False)
+    except (OSError, ValueError):
+        return None, None
+    return df, age
+
+
+def modified(country, label):
+    """Function returns the time the cached copy was written, or None if not cached"""
+    try:
+        return os.path.getmtime(__path(country, label))
+    except OSError:
+        return None
+
+
+def write(country, label, df):
+    """Function atomically writes a df to the cache so readers never see a partial file"""
+    os.makedirs(const.CACHE_DIR, exist_ok=True)
+    path = __path(country, label)
+    tmp_path = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+    df.to_json(tmp_path, orient='split', index=False)
+    os.replace(tmp_path, path)
+
+
+def __count(result):
+    with __stats_lock:
+        __stats[result] += 1
+
+
+def __path(country, label):
+    return os.path.join(const.CACHE_DIR, '{country}_{label}.json'.format(country=country, label=label))
+
+
+def refresh_in_background(country, label, fetch):
+    """Function refreshes (country, label) in a daemon thread unless a refresh is already running"""
+    key = (country, label)
+    with __refreshing_lock:
+        if key in __refreshing:
+            return
+        __refreshing.add(key)
+
+    def refresh():
+        try:
+            load(country, label, fetch)
+        except Exception:
+            pass  # Keep serving the stale copy, the next read will try again.
+        finally:
+            with __refreshing_lock:
+                __refreshing.discard(key)
+
+    threading.Thread(target=refresh, daemon=True).start()
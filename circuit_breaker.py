@@ -0,0 +1,81 @@
+"""Circuit breaker for the upstream API.
+
+After `failures` failed requests in a row the circuit opens and requests fail fast with CircuitOpen,
+so callers fall back to cached data instead of waiting on timeouts. Once the reset time has passed,
+one probe request is let through (half open): success closes the circuit, failure opens it again
+for twice as long, up to max_reset. An inconclusive probe (a 404 for one country) hands the probe
+to the next request.
+"""
+import random
+import threading
+import time
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failures, reset, max_reset):
+        self.failures = failures
+        self.reset = reset
+        self.max_reset = max_reset
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened = 0  # Times opened since the last success, doubles the reset time.
+        self.retry_at = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        """Raises CircuitOpen unless a request may go upstream now"""
+        with self.lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.time() >= self.retry_at:
+                self.state = HALF_OPEN  # This caller is the probe.
+                return
+            self.rejected += 1
+            raise CircuitOpen('upstream circuit is {}, retry in {:.0f}s'.format(
+                self.state, max(0, self.retry_at - time.time())))
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.opened = 0
+
+    def record_inconclusive(self):
+        """Records a response that says nothing about the health of the API, neither success nor failure"""
+        with self.lock:
+            if self.state == HALF_OPEN:
+                self.state = OPEN
+                self.retry_at = time.time()
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failures:
+                reset = min(self.max_reset, self.reset * 2 ** self.opened)
+                # Jitter keeps workers and servers from probing in lockstep.
+                self.retry_at = time.time() + reset * random.uniform(0.8, 1.2)
+                self.state = OPEN
+                self.opened += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(state=self.state, consecutive_failures=self.consecutive_failures,
+                        rejected=self.rejected)
+
+
+def backoff(attempt, base, maximum, retry_after=None):
+    """Function returns the seconds to wait before retry number attempt (0-based), exponential with full jitter.
+    A Retry-After header (in seconds) is honoured, capped at maximum"""
+    if retry_after is not None:
+        try:
+            return min(maximum, max(0.0, float(retry_after)))
+        except ValueError:
+            pass  # An HTTP date, fall back to our own schedule.
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
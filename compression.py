@@ -0,0 +1,89 @@
+"""Compression and ETags for the responses of the Flask server behind the app.
+
+Responses are gzip or brotli (when the brotli package is installed) encoded, whichever the client
+prefers in Accept-Encoding. Dash callbacks are POSTs, which browsers never revalidate, so content-hash
+ETags are only set on the GET payloads that change rarely: the layout, the callback dependencies and
+the continent maps (fetched from URLs versioned by the summary). A client sending the ETag back gets
+an empty 304.
+"""
+import gzip
+import hashlib
+
+import flask
+import constants as const
+import telemetry
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript')
+ETAG_PATHS = ('/_dash-layout', '/_dash-dependencies')
+ETAG_PREFIXES = ('/maps/',)
+
+RESPONSE_BYTES = telemetry.register(telemetry.Counter(
+    'http_response_bytes_total', 'Response body bytes before and after compression.', ('stage',)))
+
+
+def instrument(server):
+    """Function adds the compression and ETag hook to the Flask server behind the app"""
+    if not const.COMPRESSION_ENABLED:
+        return
+
+    @server.after_request
+    def compress_response(response):
+        if (response.direct_passthrough or response.status_code != 200 or 'Content-Encoding' in response.headers
+                or not response.mimetype.startswith(COMPRESSIBLE_TYPES)):
+            return response
+        body = response.get_data()
+        encoding = None
+        if len(body) >= const.COMPRESSION_MIN_SIZE:
+            encoding = negotiate(flask.request.headers.get('Accept-Encoding', ''))
+        response.vary.add('Accept-Encoding')
+
+        if flask.request.method == 'GET' and (flask.request.path.endswith(ETAG_PATHS) or
+                                              flask.request.path.startswith(ETAG_PREFIXES)):
+            # One tag per encoding, as the bytes sent differ.
+            etag = hashlib.md5(body).hexdigest() + ('-' + encoding if encoding else '')
+            response.set_etag(etag)
+            if response.cache_control.max_age is None:
+                response.cache_control.no_cache = True  # Revalidate every time, a 304 is nearly free.
+            if flask.request.if_none_match.contains(etag):
+                not_modified = flask.Response(status=304, headers={'ETag': response.headers['ETag'],
+                                                                    'Cache-Control': response.headers['Cache-Control']})
+                not_modified.vary.add('Accept-Encoding')
+                return not_modified
+
+        if encoding is not None:
+            compressed = __compress(body, encoding)
+            response.set_data(compressed)
+            response.headers['Content-Encoding'] = encoding
+            RESPONSE_BYTES.inc('sent', amount=len(compressed))
+        else:
+            RESPONSE_BYTES.inc('sent', amount=len(body))
+        RESPONSE_BYTES.inc('raw', amount=len(body))
+        return response
+
+
+def negotiate(accept_encoding):
+    """Function returns the supported encoding the client ranks highest ('br' or 'gzip'), or None"""
+    qualities = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        params = params.strip()
+        try:
+            qualities[name.strip().lower()] = float(params[2:]) if params.startswith('q=') else 1.0
+        except ValueError:
+            continue
+    # Ties go to the first supported encoding, brotli is smaller at the same speed.
+    supported = [name for name in ('br', 'gzip') if name != 'br' or brotli is not None]
+    ranked = [(qualities.get(name, qualities.get('*', 0)), name) for name in supported]
+    ranked = [(quality, name) for quality, name in ranked if quality > 0]
+    return max(ranked, key=lambda ranked_item: ranked_item[0])[1] if ranked else None
+
+
+def __compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=const.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=const.GZIP_LEVEL, mtime=0)
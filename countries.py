@@ -0,0 +1,61 @@
+"""Country registry (slug, label, ISO2, ISO3, continent, population) loaded once from countries.csv.
+
+The file is only read the first time a lookup is needed, and every index is built on demand.
+Rows without a slug are ISO2 codes the summary can report but the dashboard has no page for.
+Populations are mid-2020 estimates, left empty for uninhabited territories.
+"""
+import csv
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'countries.csv')
+
+Country = namedtuple('Country', ['slug', 'label', 'iso2', 'iso3', 'continent', 'population'])
+
+
+@lru_cache(maxsize=None)
+def registry():
+    """Function returns every row of the registry, countries in dropdown order first"""
+    with open(REGISTRY_PATH, newline='') as f:
+        return tuple(Country(*row) for row in list(csv.reader(f))[1:])
+
+
+@lru_cache(maxsize=None)
+def dropdown_options():
+    return [{'label': country.label, 'value': country.slug} for country in registry() if country.slug]
+
+
+@lru_cache(maxsize=None)
+def slugs():
+    return [country.slug for country in registry() if country.slug]
+
+
+@lru_cache(maxsize=None)
+def slug_to_iso2():
+    return {country.slug: country.iso2 for country in registry() if country.slug}
+
+
+@lru_cache(maxsize=None)
+def iso2_to_slug():
+    return {country.iso2: country.slug for country in registry() if country.slug}
+
+
+@lru_cache(maxsize=None)
+def iso2_to_iso3():
+    return {country.iso2: country.iso3 for country in registry() if country.iso3}
+
+
+@lru_cache(maxsize=None)
+def iso2_to_continent():
+    return {country.iso2: country.continent for country in registry() if country.continent}
+
+
+@lru_cache(maxsize=None)
+def slug_to_population():
+    return {country.slug: int(country.population) for country in registry() if country.slug and country.population}
+
+
+@lru_cache(maxsize=None)
+def slug_to_label():
+    return {country.slug: country.label for country in registry() if country.slug}
@@ -0,0 +1,184 @@
+"""Memory-mapped int32 cube of cumulative cases with shape (country, day, metric).
+
+The cube is written next to the bulk store by bulk_store.ingest. Rows follow
+country_index() (built from the country registry), columns are day offsets from the
+first reported date and the last axis follows const.LABELS. Worker processes map
+the same file read-only, so they share it through the page cache. A second array
+holds prefix sums of the daily counts, so totals over any date range are O(1).
+"""
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import constants as const
+import countries
+
+METRIC_INDEX = {label: i for i, label in enumerate(const.LABELS)}
+
+# (meta mtime, meta, mapped array) of the cube currently in use.
+__loaded = (None, None, None)
+__lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def country_index():
+    """Function returns the slug -> row index of the cube"""
+    return {slug: row for row, slug in enumerate(sorted(countries.slugs()))}
+
+
+def build(all_df):
+    """Function writes the cube from a long df (CountryCode, Date, Confirmed, Recovered, Deaths)"""
+    dates = pd.to_datetime(all_df['Date'], utc=True).dt.tz_localize(None).to_numpy().astype('datetime64[D]')
+    start = dates.min()
+    days = (dates - start).astype(np.int64)
+    codes, iso2_list = pd.factorize(all_df['CountryCode'])
+    columns = [label.title() for label in const.LABELS]
+
+    n_days = int(days.max()) + 1
+    by_iso2 = np.zeros((len(iso2_list), n_days, len(const.LABELS)), dtype=np.int32)
+    present = np.zeros((len(iso2_list), n_days), dtype=bool)
+    by_iso2[codes, days] = all_df[columns].to_numpy()
+    present[codes, days] = True
+
+    # Days a country did not report carry the previous cumulative value forward.
+    last_reported = np.maximum.accumulate(np.where(present, np.arange(n_days), 0), axis=1)
+    by_iso2 = np.take_along_axis(by_iso2, last_reported[:, :, None], axis=1)
+
+    iso2_row = {iso2: i for i, iso2 in enumerate(iso2_list)}
+    cube = np.zeros((len(country_index()), n_days, len(const.LABELS)), dtype=np.int32)
+    for slug, row in country_index().items():
+        source = iso2_row.get(countries.slug_to_iso2()[slug])
+        if source is not None:
+            cube[row] = by_iso2[source]
+    first_day = np.where(cube[:, :, 0].any(axis=1), np.argmax(cube[:, :, 0] > 0, axis=1), -1)
+
+    # Prefix sums of the Daily counts, so the total over any range of days is one subtraction.
+    daily = np.abs(np.diff(cube, axis=1, prepend=cube[:, :1]).astype(np.int64))
+    daily[np.arange(n_days)[None, :] <= first_day[:, None]] = 0
+    prefix = np.zeros((len(country_index()), n_days + 1, len(const.LABELS)), dtype=np.int64)
+    np.cumsum(daily, axis=1, out=prefix[:, 1:])
+
+    # The meta file points at the arrays, replacing it last swaps the new cube in atomically.
+    meta = dict(file=__write_array('cube', cube), prefix_file=__write_array('prefix', prefix), start=str(start),
+                first_day=first_day.tolist())
+    __write_meta(meta)
+
+
+def load():
+    """Function returns (meta, cube) mapped read-only, or (None, None) if no cube was built"""
+    global __loaded
+    try:
+        mtime = os.path.getmtime(__meta_path())
+    except OSError:
+        return None, None
+    with __lock:
+        if __loaded[0] != mtime:
+            with open(__meta_path()) as f:
+                meta = json.load(f)
+            array = np.load(os.path.join(const.BULK_STORE_DIR, meta['file']), mmap_mode='r')
+            meta['prefix'] = np.load(os.path.join(const.BULK_STORE_DIR, meta['prefix_file']), mmap_mode='r')
+            meta['start'] = np.datetime64(meta['start'], 'D')
+            __loaded = (mtime, meta, array)
+        return __loaded[1], __loaded[2]
+
+
+def has(country):
+    meta, _ = load()
+    return meta is not None and country in country_index() and meta['first_day'][country_index()[country]] >= 0
+
+
+def day_index(date):
+    """Function returns the day offset of a date ('YYYY-MM-DD...' or datetime), or None outside the cube"""
+    meta, array = load()
+    day = __day(meta, date)
+    if 0 <= day < array.shape[1]:
+        return day
+    return None
+
+
+def date_range(country):
+    """Function returns the first and last date of a country's history as 'YYYY-MM-DD' strings"""
+    meta, array = load()
+    first_day = meta['first_day'][country_index()[country]]
+    return str(meta['start'] + first_day), str(meta['start'] + array.shape[1] - 1)
+
+
+def value(country, date, label):
+    """Function returns the cumulative count of a (country, date, label) in constant time"""
+    _, array, row, day = __locate(country, date)
+    return int(array[row, day, METRIC_INDEX[label]])
+
+
+def daily(country, date, label):
+    """Function returns the daily count of a (country, date, label) like the Daily column does"""
+    meta, array, row, day = __locate(country, date)
+    if day <= meta['first_day'][row]:
+        return 0
+    column = array[row, day - 1:day + 1, METRIC_INDEX[label]]
+    return abs(int(column[1]) - int(column[0]))
+
+
+def range_total(country, start_date, end_date, label):
+    """Function returns the sum of the daily counts from start_date to end_date (inclusive) and the number of days"""
+    meta, array = load()
+    row = country_index()[country]
+    # Dates outside the cube are clamped to it, like searchsorted does on the df.
+    start = max(__day(meta, start_date), meta['first_day'][row])
+    end = min(__day(meta, end_date), array.shape[1] - 1)
+    if end < start:
+        return 0, 0
+    prefix = meta['prefix'][row, :, METRIC_INDEX[label]]
+    return int(prefix[end + 1] - prefix[start]), end - start + 1
+
+
+def series(country, label):
+    """Function returns a zero-copy view of a country's cumulative counts from day one"""
+    meta, array = load()
+    row = country_index()[country]
+    return array[row, meta['first_day'][row]:, METRIC_INDEX[label]]
+
+
+def __locate(country, date):
+    meta, array = load()
+    day = day_index(date)
+    if day is None:
+        raise KeyError(date)
+    return meta, array, country_index()[country], day
+
+
+def __day(meta, date):
+    return int((np.datetime64(str(date)[:10], 'D') - meta['start']).astype(np.int64))
+
+
+def __meta_path():
+    return os.path.join(const.BULK_STORE_DIR, 'cube.json')
+
+
+def __write_array(name, array):
+    file_name = '{}-{}-{}.npy'.format(name, os.getpid(), time.time_ns())
+    os.makedirs(const.BULK_STORE_DIR, exist_ok=True)
+    np.save(os.path.join(const.BULK_STORE_DIR, file_name), array)
+    return file_name
+
+
+def __write_meta(meta):
+    old_files = []
+    if os.path.exists(__meta_path()):
+        with open(__meta_path()) as f:
+            old_meta = json.load(f)
+        old_files = [old_meta.get('file'), old_meta.get('prefix_file')]
+    tmp_path = '{}.{}.{}.tmp'.format(__meta_path(), os.getpid(), threading.get_ident())
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, __meta_path())
+
+    # Processes that still map the old arrays keep them alive until they reload.
+    for old_file in old_files:
+        if old_file is not None and old_file not in (meta['file'], meta['prefix_file']):
+            try:
+                os.remove(os.path.join(const.BULK_STORE_DIR, old_file))
+            except OSError:
+                pass
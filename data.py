@@ -1,23 +1,79 @@
+import json
+import threading
+import time
 import requests
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import constants as const
-import ast
-from dash.exceptions import PreventUpdate
+import countries
+import cache
+import circuit_breaker
+import store
+import bulk_store
+import telemetry
+
+# Shared keep-alive session so every fetch reuses pooled connections to the API.
+session = requests.Session()
+for prefix in ('https://', 'http://'):
+    session.mount(prefix, requests.adapters.HTTPAdapter(pool_connections=const.POOL_SIZE,
+                                                         pool_maxsize=const.POOL_SIZE))
+
+# Opens after repeated upstream failures so callbacks fail fast instead of waiting on timeouts.
+breaker = circuit_breaker.CircuitBreaker(const.BREAKER_FAILURES, const.BREAKER_RESET, const.BREAKER_MAX_RESET)
+
+# Statuses worth retrying, other responses are returned or raised as is.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Client errors refusing every request (bad or revoked access), counted as failures like 5xx. Other 4xx
+# (a 404 for an unknown country) are about the one request and say nothing about the health of the API.
+REFUSED_STATUSES = {401, 403}
+
+# Worker threads used to fetch the labels of a country at the same time.
+__executor = ThreadPoolExecutor(max_workers=const.POOL_SIZE)
+
+# Last summary df read from the cache and the version (cache mtime) it was read at.
+__summary = (None, None)
+__summary_lock = threading.Lock()
 
-# def get_all_data():
-#     url = 'https://api.covid19api.com/all'
-#     json_string = requests.get(url).json()
-#     df = pd.DataFrame(json_string)
-#     df = df[['Country', 'CountryCode', 'Confirmed', 'Deaths', 'Recovered', 'Date']]
-#     print(df.memory_usage(index=True).sum())
 
 def get_total_daily_df(country, label):
-    url = 'https://api.covid19api.com/total/dayone/country/{country}/status/{label}'
+    """Function returns the daily df for a country from the bulk store, else from the on-disk cache.
+    When nothing is on disk and upstream fails (or the circuit is open), the last copy this process served is used"""
+    df = bulk_store.read(country, label)
+    if df is not None:
+        return df
+    try:
+        return cache.get(country, label, __fetch)
+    except (circuit_breaker.CircuitOpen, requests.RequestException):
+        df = store.latest(country, label)
+        if df is None:
+            raise
+        return df
+
+
+def refresh_cache(country, label, max_age):
+    """Function fetches (country, label) into the on-disk cache if it is missing or older than max_age seconds"""
+    if label != const.SUMMARY_LABEL and bulk_store.has(country):
+        return False
+    _, age = cache.read(country, label)
+    if age is not None and age <= max_age:
+        return False
+    cache.load(country, label, __fetch, max_age)
+    return True
+
+
+def __fetch(country, label):
+    if label == const.SUMMARY_LABEL:
+        return __fetch_summary_df()
+    return __fetch_total_daily_df(country, label)
+
+
+def __fetch_total_daily_df(country, label):
+    url = const.API_URL + '/total/dayone/country/{country}/status/{label}'
     url = url.format(country=country, label=label)  # Getting data for respective country.
 
-    json_string = requests.get(url).json()
-    df = pd.DataFrame(json_string)
+    response = __get(url, 'total_dayone', const.REQUEST_TIMEOUT)
+    df = pd.DataFrame(response.json())
 
     df = df[['Cases', 'Date']]
     df['Daily'] = df['Cases'] - df['Cases'].shift()
@@ -25,20 +81,131 @@ def get_total_daily_df(country, label):
     df.fillna(value=0, inplace=True)
     return df
 
-def get_data(country):
-    data_dict = {}
+def get_dfs(country):
+    """Function returns the daily df of every label for a country, as a dict label -> df"""
+    # Getting total cases, deaths, recovered concurrently.
+    futures = {label: __executor.submit(get_total_daily_df, country, label) for label in const.LABELS}
+    return {label: future.result() for label, future in futures.items()}
+
+
+def get_all_data():
+    """Function returns every country's daily totals from the /all endpoint in one df"""
+    url = const.API_URL + '/all'
+
+    response = __get(url, 'all', const.BULK_REQUEST_TIMEOUT)
+    df = pd.DataFrame(response.json())
+    df = df[['CountryCode', 'Province', 'Confirmed', 'Recovered', 'Deaths', 'Date']]
+
+    # Countries reporting a country-wide row are taken as is, the others are summed over provinces.
+    df['IsTotal'] = df['Province'] == ''
+    df = df[df['IsTotal'] | ~df.groupby('CountryCode')['IsTotal'].transform('any')]
+    return df.groupby(['CountryCode', 'Date'], as_index=False)[['Confirmed', 'Recovered', 'Deaths']].sum()
 
-    # Getting total cases, deaths, recovered.
-    for label in const.LABELS:
-        data_dict[label] = get_total_daily_df(country, label)
-    return data_dict['confirmed'].to_json(), data_dict['recovered'].to_json(), data_dict['deaths'].to_json()
 
+def get_summary_snapshot():
+    """Function returns the last persisted summary df (None if there is none) without waiting on the network,
+    a missing or expired snapshot is refreshed in the background. The df is parsed once per snapshot"""
+    global __summary
+    version = get_summary_version()
+    if version is None:
+        return None
+    with __summary_lock:
+        if __summary[0] != version:
+            summary, _ = cache.read(const.WORLD, const.SUMMARY_LABEL)
+            if summary is None:
+                return None
+            __summary = (version, summary)
+        return __summary[1]
 
-def get_summary():
-    url = 'https://api.covid19api.com/summary'
 
-    json_string = requests.get(url).json()
+def get_summary_version(refresh=True):
+    """Function returns a version of the persisted summary (the time it was written), None if there is none,
+    a missing or expired snapshot is refreshed in the background unless refresh is False"""
+    version = cache.modified(const.WORLD, const.SUMMARY_LABEL)
+    if refresh and (version is None or time.time() - version > const.CACHE_TTL):
+        cache.refresh_in_background(const.WORLD, const.SUMMARY_LABEL, __fetch)
+    return version
+
+
+def __fetch_summary_df():
+    url = const.API_URL + '/summary'
+
+    json_string = __get(url, 'summary', const.REQUEST_TIMEOUT).json()
     df = pd.DataFrame(json_string['Countries'])
-    df = df[['Country', 'CountryCode', 'Slug', 'TotalConfirmed', 'TotalDeaths', 'TotalRecovered']].to_json()
+    df = df[['Country', 'CountryCode', 'Slug', 'TotalConfirmed', 'TotalDeaths', 'TotalRecovered']]
+    df = df.assign(ISO3=df['CountryCode'].map(countries.iso2_to_iso3()))  # Locations of the choropleth map.
 
     return df
+
+
+def __get(url, endpoint, timeout):
+    """Function requests an upstream endpoint through the circuit breaker, retrying 429/5xx and request errors
+    with jittered exponential backoff, and records the latency of every attempt by endpoint and status"""
+    breaker.before_call()
+    for attempt in range(const.RETRY_ATTEMPTS + 1):
+        response = None
+        started = time.perf_counter()
+        status = 'error'
+        try:
+            response = session.get(url, timeout=timeout)
+            status = response.status_code
+        except requests.RequestException as error:
+            failure = error
+        else:
+            if status < 400:
+                breaker.record_success()
+                return response
+            if status not in RETRY_STATUSES:
+                if status in REFUSED_STATUSES or status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_inconclusive()
+                response.raise_for_status()
+            failure = requests.HTTPError('{} for url: {}'.format(status, url), response=response)
+        finally:
+            telemetry.observe_upstream(endpoint, status, time.perf_counter() - started)
+        if attempt < const.RETRY_ATTEMPTS:
+            retry_after = response.headers.get('Retry-After') if response is not None else None
+            time.sleep(circuit_breaker.backoff(attempt, const.RETRY_BACKOFF, const.RETRY_MAX_BACKOFF, retry_after))
+    breaker.record_failure()
+    raise failure
+
+
+def __load(country, label):
+    """Function reloads the df behind a server-side handle"""
+    if label == const.SUMMARY_LABEL:
+        return cache.get(country, label, __fetch)
+    return get_total_daily_df(country, label)
+
+
+def resolve(handle):
+    """Function returns the df behind a server-side handle, reloading it if this process does not hold it"""
+    return store.get(handle, __load)
+
+
+def range_total(df, start_date, end_date):
+    """Function returns the sum of the Daily column from start_date to end_date (inclusive) and the number of days"""
+    dates = pd.DatetimeIndex(pd.to_datetime(df['Date'], utc=True)).tz_localize(None).normalize()
+    prefix = np.concatenate(([0], np.cumsum(df['Daily'].to_numpy())))
+    start = dates.searchsorted(pd.Timestamp(start_date[:10]))
+    end = dates.searchsorted(pd.Timestamp(end_date[:10]), side='right')
+    if end <= start:
+        return 0, 0
+    return int(prefix[end] - prefix[start]), int(end - start)
+
+
+def encode_df(df):
+    """Function converts a df to a columnar payload (column -> list of values) for a dcc.Store"""
+    return {column: df[column].tolist() for column in df.columns}
+
+
+def decode_df(payload):
+    """Function converts a dcc.Store payload (columnar df or server-side handle) back to a df"""
+    if isinstance(payload, str):
+        # Payloads written by older versions with df.to_json() are still sitting in localStorage.
+        payload = json.loads(payload)
+    telemetry.observe_decode()
+    if store.is_handle(payload):
+        return resolve(payload)
+    if isinstance(payload, dict):
+        return pd.DataFrame(payload)
@@ -0,0 +1,132 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import plotly
+import constants as const
+
+
+class SharedFigureStore:
+    """Figures shared by every worker process through one SQLite file next to the on-disk cache"""
+
+    def __init__(self, path, max_size):
+        self.path = path
+        self.max_size = max_size
+        self.__local = threading.local()
+
+    def get(self, name, key, version):
+        row = self.__connection().execute('SELECT figure FROM figures WHERE key = ? AND version = ?',
+                                          (self.__key(name, key), version)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, name, key, version, figure):
+        payload = json.dumps(figure, cls=plotly.utils.PlotlyJSONEncoder)
+        connection = self.__connection()
+        with connection:
+            connection.execute('INSERT OR REPLACE INTO figures (key, version, figure, updated) VALUES (?, ?, ?, ?)',
+                               (self.__key(name, key), version, payload, time.time()))
+            # Only trim once the store is full, the delete walks the updated index.
+            if connection.execute('SELECT COUNT(*) FROM figures').fetchone()[0] > self.max_size:
+                connection.execute('DELETE FROM figures WHERE key IN (SELECT key FROM figures ORDER BY updated DESC '
+                                   'LIMIT -1 OFFSET ?)', (self.max_size,))
+
+    def __connection(self):
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS figures '
+                               '(key TEXT PRIMARY KEY, version TEXT, figure TEXT, updated REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS figures_updated ON figures (updated)')
+            self.__local.connection = connection
+        return connection
+
+    @staticmethod
+    def __key(name, key):
+        return json.dumps([name, key], default=str)
+
+
+class FigureCache:
+    """Bounded LRU cache of figure payloads, one entry per key and only for the latest data version.
+    With a shared store, misses are looked up there before building, so workers reuse each other's figures."""
+
+    def __init__(self, max_size, name=None, shared=None):
+        self.max_size = max_size
+        self.name = name
+        self.shared = shared
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.__entries = OrderedDict()  # key -> (version, figure)
+        self.__lock = threading.Lock()
+
+    def get(self, key, version):
+        """Returns the cached figure for key if it was built from the same data version, else None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        figure = self.__get_shared(key, version)
+        with self.__lock:
+            if figure is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+        self.__put_local(key, version, figure)
+        return figure
+
+    def put(self, key, version, figure):
+        self.__put_local(key, version, figure)
+        if self.shared is not None:
+            try:
+                self.shared.put(self.name, key, str(version), figure)
+            except sqlite3.Error:
+                pass  # The shared store is only an optimization.
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        with self.__lock:
+            return dict(size=len(self.__entries), max_size=self.max_size, hits=self.hits,
+                        shared_hits=self.shared_hits, misses=self.misses, evictions=self.evictions,
+                        invalidations=self.invalidations)
+
+    def __get_shared(self, key, version):
+        if self.shared is None:
+            return None
+        try:
+            return self.shared.get(self.name, key, str(version))
+        except sqlite3.Error:
+            return None
+
+    def __put_local(self, key, version, figure):
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            if entry is not None and entry[0] != version:
+                # The series behind this figure were refreshed.
+                self.invalidations += 1
+            self.__entries[key] = (version, figure)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+
+# Figures shared across worker processes (see serve.py).
+shared = SharedFigureStore(os.path.join(const.CACHE_DIR, 'figures.sqlite'),
+                           const.FIGURE_CACHE_SIZE * 4) if const.SHARED_FIGURE_CACHE else None
+
+# Main graph figures keyed by (country, graph type).
+graphs = FigureCache(const.FIGURE_CACHE_SIZE, 'graphs', shared)
+
+# Choropleth maps keyed by continent scope.
+maps = FigureCache(len(set(const.CONTINENTS.values())) + 1, 'maps', shared)
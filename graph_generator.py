@@ -1,9 +1,12 @@
+import numpy as np
 import constants as const
+import countries
+import metrics
 import plotly.graph_objs as go
 
 
-def tracer(graph_type, data_df):
-    """Functions return a list with the right TRACER"""
+def tracer(graph_type, data_df, country=None):
+    """Functions return a list with the right TRACER, metrics of a country in the cube come from metrics.world()"""
     tracer_list = None
     if graph_type == const.GRAPH_TYPE.SCATTER_TOTAL_CASES:
         tracer_list = __total_cases_scatter(data_df)
@@ -15,28 +18,49 @@ def tracer(graph_type, data_df):
         tracer_list = __daily_deaths_bar(data_df)
     elif graph_type == const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED:
         tracer_list = __daily_confirmed_recovered_deaths_stacked_bar(data_df)
+    elif graph_type == const.GRAPH_TYPE.SCATTER_ROLLING_AVERAGE:
+        tracer_list = __rolling_average_scatter(data_df, country)
+    elif graph_type == const.GRAPH_TYPE.SCATTER_GROWTH_RATE:
+        tracer_list = __metric_scatter(data_df, country, 'growth_rate', 'Growth Rate')
+    elif graph_type == const.GRAPH_TYPE.SCATTER_DOUBLING_TIME:
+        tracer_list = __metric_scatter(data_df, country, 'doubling_time', 'Doubling Time')
+    elif graph_type == const.GRAPH_TYPE.SCATTER_ACTIVE_CASES:
+        tracer_list = __metric_scatter(data_df, country, 'active', 'Active Cases')
 
     return tracer_list
 
 
 def generic_layout_generator(graphType, country, showLegend):
     """Function generates the LAYOUT for a desired graph"""
-    if graphType == const.GRAPH_TYPE.SCATTER_TOTAL_CASES:
-        return __layout_generator_scatter(country, showLegend)
-    elif graphType == const.GRAPH_TYPE.BAR_DAILY_CONFIRMED:
-        return __layout_generator_bar(country, showLegend, const.MODE_DAILY_CASES)
-    elif graphType == const.GRAPH_TYPE.BAR_DAILY_RECOVERED:
-        return __layout_generator_bar(country, showLegend, const.MODE_DAILY_RECOVERED)
-    elif graphType == const.GRAPH_TYPE.BAR_DAILY_DEATHS:
-        return __layout_generator_bar(country, showLegend, const.MODE_DAILY_DEATHS)
-    elif graphType == const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED:
-        return __layout_generator_bar(country, showLegend, const.MODE_STACK)
-    else:
+    if graphType not in __LAYOUTS:
         return {}
+    title_format, legend_key, layout = __LAYOUTS[graphType]
+    layout = dict(layout)
+    layout['title'] = dict(text=title_format.format(country=country.title()), font=__title_font(20))
+    layout[legend_key] = showLegend
+    return layout
 
 
-def get_map(country, summary_df):
-    return dict(data=[__continent_map(summary_df)], layout=__layout_generator_map(country))
+def get_map(scope, summary_df):
+    return dict(data=[__continent_map(summary_df)], layout=__layout_generator_map(scope))
+
+
+def get_comparison(slugs, aligned, found, label, per_capita):
+    """Function returns the figure overlaying countries aligned by alignment.compare, the ones that never
+    reached the threshold are left out"""
+    labels = countries.slug_to_label()
+    data = []
+    for slug, values, reached in zip(slugs, aligned, found):
+        values = values[~np.isnan(values)]
+        if reached and len(values):
+            data.append(go.Scatter(x=np.arange(len(values)), y=values, name=labels.get(slug, slug.title()),
+                                   mode='lines').to_plotly_json())
+    return dict(data=data, layout=__comparison_layout(label, per_capita))
+
+
+def map_scope(country):
+    """Function returns the geo scope of the continent a country belongs to"""
+    return const.CONTINENTS.get(countries.iso2_to_continent().get(countries.slug_to_iso2().get(country)), 'world')
 
 
 # ALL TRACERS
@@ -97,10 +121,43 @@ def __daily_confirmed_recovered_deaths_stacked_bar(data_df):
     return tracer_list
 
 
+def __country_metrics(data_df, country):
+    """Function returns the metrics of a country from the batched world result when it is in the cube,
+    else runs the metrics engine on its dfs, aligned on the confirmed dates"""
+    if country is not None:
+        dates, result = metrics.country(country)
+        if result is not None:
+            return dates, result
+    dates = data_df['confirmed']['Date']
+    cumulative = np.stack([data_df[label].drop_duplicates('Date').set_index('Date')['Cases'].reindex(dates)
+                           .ffill().fillna(0).to_numpy() for label in const.LABELS], axis=-1)
+    return dates, metrics.compute(cumulative[np.newaxis])
+
+
+def __rolling_average_scatter(data_df, country):
+    """Function defines the TRACER for the 7 and 14 day rolling averages of the daily counts"""
+    dates, result = __country_metrics(data_df, country)
+    tracer_list = []
+    for window, dash in zip(metrics.WINDOWS, ['solid', 'dot']):
+        for i, (label, color) in enumerate(zip(const.LABELS, const.COLORS)):
+            tracer_list.append(go.Scatter(x=dates,
+                                          y=result['rolling_{}'.format(window)][0, :, i],
+                                          name='{} ({} Days)'.format(label.title(), window),
+                                          line=dict(color=color, dash=dash)))
+    return tracer_list
+
+
+def __metric_scatter(data_df, country, metric, name):
+    dates, result = __country_metrics(data_df, country)
+    return [go.Scatter(x=dates, y=result[metric][0], name=name, line=dict(color=const.COLORS[0]))]
+
+
 def __continent_map(df):
+    if 'ISO3' not in df:
+        # Summaries stored by older versions do not carry the ISO3 column yet.
+        df = df.assign(ISO3=df['CountryCode'].map(countries.iso2_to_iso3()))
     return go.Choropleth(
-        locations=df['CountryCode'].apply(
-            lambda iso2: const.ISO2_TO_ISO3.get(str(iso2))),
+        locations=df['ISO3'],
         z=df['TotalConfirmed'],
         text=df['Country'],
         colorscale='Reds',
@@ -111,326 +168,101 @@ def __continent_map(df):
 
 
 # ALL LAYOUTS
-def __layout_generator_bar(country, showLegend, mode):
-    """Function generates the LAYOUT for the daily-case bar chart."""
-    if mode == const.MODE_DAILY_CASES:
-        return dict(
-            title=dict(
-                text='Daily Cases ' + country.title(),
-                font=dict(
-                    color='white',
-                    size=20
-                )
-            ),
-            xaxis=dict(
-                color='white',
-                title=dict(
-                    text='Date',
-                    font=dict(
-                        color='white',
-                        size=16
-                    ),
-                ),
-                tickfont=dict(size=13),
-                showgrid=True,
-                rangeselector=dict(
-                    bgcolor='#444444',
-                    font=dict(
-                        size=14,
-                        color='white'
-                    ),
-                    buttons=list([
-                        dict(count=1,
-                             label="1 Month",
-                             step="month",
-                             stepmode="backward"),
-                        dict(count=3,
-                             label="3 Months",
-                             step="month",
-                             stepmode="backward"),
-                        dict(count=6,
-                             label="6 Months",
-                             step="month",
-                             stepmode="backward"),
-                        dict(label='ALL',
-                             step="all")
-                    ]),
-                )
-            ),
-            yaxis=dict(
-                color='white',
-                title=dict(
-                    text='Number of Daily Cases',
-                    font=dict(
-                        color='white',
-                        size=16,
-                    )
-                ),
-                tickfont=dict(size=13)
-            ),
-            showLegend=showLegend,
-            paper_bgcolor='#222222',
-            plot_bgcolor='#222222'
-        )
-    elif mode == const.MODE_DAILY_DEATHS:
-        return dict(
-            title=dict(
-                text='Daily Deaths ' + country.title(),
-                font=dict(
-                    color='white',
-                    size=20
-                )
-            ),
-            xaxis=dict(
-                title=dict(
-                    text='Date',
-                    font=dict(
-                        color='white',
-                        size=16
-                    )
-                ),
-                color='white',
-                tickfont=dict(size=13),
-                showgrid=True,
-                rangeselector=dict(
-                    bgcolor='#444444',
-                    font=dict(
-                        size=14,
-                        color='white'
-                    ),
-                    buttons=list([
-                        dict(count=1,
-                             label="1 Month",
-                             step="month",
-                             stepmode="backward"),
-                        dict(count=3,
-                             label="3 Months",
-                             step="month",
-                             stepmode="backward"),
-                        dict(count=6,
-                             label="6 Months",
-                             step="month",
-                             stepmode="backward"),
-                        dict(label='ALL',
-                             step="all")
-                    ])
-                )
-            ),
-            yaxis=dict(
-                title=dict(
-                    text='Number of Daily Deaths',
-                    font=dict(
-                        color='white',
-                        size=16
-                    )
-                ),
-                color='white',
-                tickfont=dict(size=13)
-            ),
-            showLegend=showLegend,
-            paper_bgcolor='#222222',
-            plot_bgcolor='#222222'
-        )
-    elif mode == const.MODE_DAILY_RECOVERED:
-        return dict(
-            title=dict(
-                text='Daily Recovered ' + country.title(),
-                font=dict(
-                    color='white',
-                    size=20
-                )
-            ),
-            xaxis=dict(
-                title=dict(
-                    text='Date',
-                    font=dict(
-                        size=16,
-                        color='white'
-                    )
-                ),
-                tickfont=dict(size=13),
-                color='white',
-                showgrid=True,
-                rangeselector=dict(
-                    bgcolor='#444444',
-                    font=dict(
-                        size=14,
-                        color='white'
-                    ),
-                    buttons=list([
-                        dict(count=1,
-                             label="1 Month",
-                             step="month",
-                             stepmode="backward"),
-                        dict(count=3,
-                             label="3 Months",
-                             step="month",
-                             stepmode="backward"),
-                        dict(count=6,
-                             label="6 Months",
-                             step="month",
-                             stepmode="backward"),
-                        dict(label='ALL',
-                             step="all")
-                    ])
-                )
-            ),
-            yaxis=dict(
-                title=dict(
-                    text='Number of Daily Recovered',
-                    font=dict(
-                        color='white',
-                        size=16
-                    )
-                ),
-                color='white',
-                tickfont=dict(size=13)
-            ),
-            showLegend=showLegend,
-            paper_bgcolor='#222222',
-            plot_bgcolor='#222222'
-        )
-    elif mode == const.MODE_STACK:
-        return dict(
-            title=dict(
-                text='Daily (Confirmed - Recovered - Deaths) ' +
-                     country.title(),
-                font=dict(
-                    color='white',
-                    size=20
-                )
-            ),
-            xaxis=dict(
-                title=dict(
-                    text='Date',
-                    font=dict(
-                        color='white',
-                        size=16
-                    )
-                ),
-                color='white',
-                showgrid=True,
-                tickfont=dict(size=13),
-                rangeselector=dict(
-                    bgcolor='#444444',
-                    font=dict(
-                        size=14,
-                        color='white'
-                    ),
-                    buttons=list([
-                        dict(count=1,
-                             label="1 Month",
-                             step="month",
-                             stepmode="backward"),
-                        dict(count=3,
-                             label="3 Months",
-                             step="month",
-                             stepmode="backward"),
-                        dict(count=6,
-                             label="6 Months",
-                             step="month",
-                             stepmode="backward"),
-                        dict(label='ALL',
-                             step="all")
-                    ])
-                )
-            ),
-            yaxis=dict(
-                title=dict(
-                    text='# Daily Confirmed, Recovered and Deaths',
-                    font=dict(
-                        color='white',
-                        size=16,
-                    )
-                ),
-                color='white',
-                tickfont=dict(size=13)
-            ),
-            showLegend=showLegend,
-            legend=dict(
-                x=0.01, y=0.95,
-                bgcolor="#333333",
-                font=dict(
-                    color='white',
-                    size=16
-                ),
-            ),
-            barmode=mode,
-            paper_bgcolor='#222222',
-            plot_bgcolor='#222222'
-        )
-
-
-def __layout_generator_scatter(country, showlegend):
-    """Function generates the LAYOUT for total-case scatter plot."""
+# Layouts are built once at import time. Per call only the title and the legend flag are swapped in on a
+# shallow copy, the nested styling dicts are shared and must not be mutated.
+def __title_font(size):
+    return dict(color='white', size=size)
+
+
+def __axis_title(text):
+    return dict(text=text, font=__title_font(16))
+
+
+__RANGE_BUTTONS = [
+    dict(count=1, label="1 Month", step="month", stepmode="backward"),
+    dict(count=3, label="3 Months", step="month", stepmode="backward"),
+    dict(count=6, label="6 Months", step="month", stepmode="backward"),
+    dict(label='ALL', step="all")
+]
+
+__DATE_AXIS = dict(
+    color='white',
+    title=__axis_title('Date'),
+    tickfont=dict(size=13),
+    showgrid=True,
+    rangeselector=dict(bgcolor='#444444', font=__title_font(14), buttons=__RANGE_BUTTONS)
+)
+
+__LEGEND = dict(x=0.01, y=0.95, bgcolor="#333333", font=__title_font(16))
+
+
+def __count_axis(text):
+    return dict(color='white', title=__axis_title(text), tickfont=dict(size=13))
+
+
+def __bar_layout(y_title, **extra):
+    return dict(xaxis=__DATE_AXIS, yaxis=__count_axis(y_title), paper_bgcolor='#222222', plot_bgcolor='#222222',
+                **extra)
+
+
+def __scatter_layout(y_title, **y_extra):
     return dict(
         legend_orientation="h",
-        title=dict(
-            text='Total Cases (' + country.title() + ')',
-            font=dict(
-                color='white',
-                size=20
-            )
-        ),
-        showlegend=showlegend,
-        legend=dict(
-            x=0.01, y=0.95,
-            bgcolor="#333333",
-            font=dict(
-                color='white',
-                size=16
-            )
-        ),
+        legend=__LEGEND,
         color='white',
-        yaxis=dict(
-            color='white',
-            title=dict(
-                text='Number of People',
-                font=dict(
-                    size=16,
-                    color='white'
-                ),
-            ),
-            tickfont=dict(size=13)
-        ),
-        xaxis=dict(
-            color='white',
-            title=dict(
-                text='Date',
-                font=dict(
-                    size=16,
-                    color='white'
-                )
-            ),
-            tickfont=dict(size=13),
-            showgrid=True,
-            rangeselector=dict(
-                bgcolor='#444444',
-                font=dict(
-                    color='white'
-                ),
-                buttons=list([
-                    dict(count=1,
-                         label="1 Month",
-                         step="month",
-                         stepmode="backward"),
-                    dict(count=3,
-                         label="3 Months",
-                         step="month",
-                         stepmode="backward"),
-                    dict(count=6,
-                         label="6 Months",
-                         step="month",
-                         stepmode="backward"),
-                    dict(label='ALL',
-                         step="all")
-                ])
-            )
-        ), paper_bgcolor='#222222', plot_bgcolor='#222222'
+        yaxis=dict(__count_axis(y_title), **y_extra),
+        xaxis=dict(__DATE_AXIS, rangeselector=dict(bgcolor='#444444', font=dict(color='white'),
+                                                   buttons=__RANGE_BUTTONS)),
+        paper_bgcolor='#222222',
+        plot_bgcolor='#222222'
+    )
+
+
+# GRAPH_TYPE -> (title format, legend flag key, layout without title)
+__LAYOUTS = {
+    const.GRAPH_TYPE.SCATTER_TOTAL_CASES: (
+        'Total Cases ({country})', 'showlegend', __scatter_layout('Number of People')),
+    const.GRAPH_TYPE.SCATTER_ROLLING_AVERAGE: (
+        'Rolling Average of Daily Counts ({country})', 'showlegend', __scatter_layout('Daily Average')),
+    const.GRAPH_TYPE.SCATTER_GROWTH_RATE: (
+        'Daily Growth Rate of Cases ({country})', 'showlegend', __scatter_layout('Growth Rate', tickformat='.1%')),
+    const.GRAPH_TYPE.SCATTER_DOUBLING_TIME: (
+        'Doubling Time of Cases ({country})', 'showlegend', __scatter_layout('Days')),
+    const.GRAPH_TYPE.SCATTER_ACTIVE_CASES: (
+        'Active Cases ({country})', 'showlegend', __scatter_layout('Number of People')),
+    const.GRAPH_TYPE.BAR_DAILY_CONFIRMED: (
+        'Daily Cases {country}', 'showLegend', __bar_layout('Number of Daily Cases')),
+    const.GRAPH_TYPE.BAR_DAILY_RECOVERED: (
+        'Daily Recovered {country}', 'showLegend', __bar_layout('Number of Daily Recovered')),
+    const.GRAPH_TYPE.BAR_DAILY_DEATHS: (
+        'Daily Deaths {country}', 'showLegend', __bar_layout('Number of Daily Deaths')),
+    const.GRAPH_TYPE.BAR_DAILY_DEATHS_RECOVERED_STACKED: (
+        'Daily (Confirmed - Recovered - Deaths) {country}', 'showLegend',
+        __bar_layout('# Daily Confirmed, Recovered and Deaths', legend=__LEGEND, barmode=const.MODE_STACK)),
+}
+
+
+def __comparison_layout(label, per_capita):
+    what = 'Confirmed Cases' if label == 'confirmed' else 'Deaths'
+    since = '{} {}'.format(__ordinal(const.ALIGNMENTS[label]), 'Case' if label == 'confirmed' else 'Death')
+    y_title = '{} per {:,} People'.format(what, const.PER_CAPITA) if per_capita else what
+    return dict(
+        title=dict(text='{} Since the {}'.format(what, since), font=__title_font(20)),
+        legend=__LEGEND,
+        xaxis=dict(color='white', title=__axis_title('Days Since the {}'.format(since)), tickfont=dict(size=13),
+                   showgrid=True),
+        yaxis=dict(__count_axis(y_title), type='log'),
+        paper_bgcolor='#222222',
+        plot_bgcolor='#222222'
     )
 
 
-def __layout_generator_map(country):
+def __ordinal(number):
+    suffix = 'th' if 10 <= number % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+    return '{}{}'.format(number, suffix)
+
+
+def __layout_generator_map(scope):
     return dict(
         title=dict(
             text='Continent Overview',
@@ -442,7 +274,7 @@ def __layout_generator_map(country):
         height=1000,
         dragmode=False,
         geo=dict(
-            scope=const.CONTINENTS[const.ISO2_TO_CONTINENT[const.COUNTRY_ISO2[country]]],
+            scope=scope,
             showframe=False,
             countrywidth=1.5,
             countrycolor='white',
@@ -0,0 +1,111 @@
+"""Vectorized derived metrics over a (country, day, metric) array of cumulative counts.
+
+compute works for one country or the whole world at once and can extend a previous
+result when new days are appended, only the new days are then computed.
+"""
+import threading
+import numpy as np
+import constants as const
+import cube
+
+WINDOWS = (7, 14)
+DOUBLING_WINDOW = 7
+
+CONFIRMED = const.LABELS.index('confirmed')
+RECOVERED = const.LABELS.index('recovered')
+DEATHS = const.LABELS.index('deaths')
+
+# Per-day series of a result, each with the country on the first axis.
+SERIES = tuple('rolling_{}'.format(window) for window in WINDOWS) + ('growth_rate', 'doubling_time', 'active')
+
+# (cube file, metrics) computed for the whole world.
+__world = (None, None)
+__world_lock = threading.Lock()
+
+
+def compute(cumulative, previous=None):
+    """Function returns a dict of derived metrics, every array has shape (country, day[, metric]):
+        rolling_7 / rolling_14: rolling averages of the daily counts per metric
+        growth_rate: day-over-day growth of confirmed cases
+        doubling_time: days for confirmed cases to double at the growth of the last week
+        active: confirmed - recovered - deaths
+    """
+    cumulative = np.asarray(cumulative, dtype=np.float64)
+    n_countries, n_days, n_metrics = cumulative.shape
+
+    start = 0
+    if previous is not None and previous['countries'] == n_countries and previous['days'] <= n_days:
+        start = previous['days']
+
+    # Daily counts of the new days (the first day of a history has no daily count).
+    daily = np.abs(np.diff(cumulative[:, max(start - 1, 0):], axis=1))
+    if start == 0:
+        daily = np.concatenate((np.zeros((n_countries, 1, n_metrics)), daily), axis=1)
+
+    prefix = np.zeros((n_countries, n_days + 1, n_metrics))
+    if start > 0:
+        prefix[:, :start + 1] = previous['prefix']
+    np.cumsum(daily, axis=1, out=prefix[:, start + 1:])
+    prefix[:, start + 1:] += prefix[:, start:start + 1]
+
+    days = np.arange(start, n_days)
+    result = dict(countries=n_countries, days=n_days, prefix=prefix, last=cumulative[:, -1])
+    for window in WINDOWS:
+        low = np.maximum(days + 1 - window, 0)
+        rolling = (prefix[:, days + 1] - prefix[:, low]) / (days + 1 - low)[None, :, None]
+        result['rolling_{}'.format(window)] = rolling
+
+    confirmed = cumulative[:, :, CONFIRMED]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        before = confirmed[:, np.maximum(days - 1, 0)]
+        result['growth_rate'] = np.where((days > 0) & (before > 0), daily[:, :, CONFIRMED] / before, np.nan)
+
+        week_before = confirmed[:, np.maximum(days - DOUBLING_WINDOW, 0)]
+        ratio = confirmed[:, days] / week_before
+        valid = (days >= DOUBLING_WINDOW) & (week_before > 0) & (ratio > 1)
+        result['doubling_time'] = np.where(valid, DOUBLING_WINDOW * np.log(2) / np.log(ratio), np.nan)
+
+    result['active'] = confirmed[:, days] - cumulative[:, days, RECOVERED] - cumulative[:, days, DEATHS]
+
+    if start > 0:
+        for key in SERIES:
+            result[key] = np.concatenate((previous[key], result[key]), axis=1)
+    return result
+
+
+def world():
+    """Function returns the metrics of every country in the cube, extending the last result when the cube grows"""
+    global __world
+    meta, array = cube.load()
+    if meta is None:
+        return None
+    with __world_lock:
+        cube_file, previous = __world
+        if cube_file != meta['file']:
+            if previous is not None and (previous.get('start') != meta['start'] or
+                                         __changed(previous, array)):
+                previous = None
+            result = compute(array, previous)
+            result['start'] = meta['start']
+            result['first_day'] = meta['first_day']
+            __world = (meta['file'], result)
+        return __world[1]
+
+
+def country(slug):
+    """Function returns the dates and the metrics (first axis of length 1) of one country from day one,
+    sliced out of world(), or (None, None) if the country is not in the cube"""
+    result = world()
+    if result is None or not cube.has(slug):
+        return None, None
+    row = cube.country_index()[slug]
+    first_day = result['first_day'][row]
+    dates = np.datetime_as_string(result['start'] + np.arange(first_day, result['days']))
+    return dates, {key: result[key][row:row + 1, first_day:] for key in SERIES}
+
+
+def __changed(previous, array):
+    """Function checks whether the last day already computed was revised in a newer cube"""
+    if previous['days'] > array.shape[1]:
+        return True
+    return not np.array_equal(array[:, previous['days'] - 1], previous['last'])
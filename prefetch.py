@@ -0,0 +1,95 @@
+"""Background scheduler keeping the summary and every country warm in the on-disk cache.
+
+Start it next to the Dash server with prefetch.start(), or on its own with `python prefetch.py`.
+Countries requested recently are refreshed first, the rest follow the dropdown order.
+When several worker processes share the cache (see serve.py), only the one holding the leader lock
+prefetches; the others retry the lock every round and take over if the leader exits.
+"""
+import fcntl
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import constants as const
+import countries
+import data
+
+# Country slug -> time it was last requested by a user.
+__last_requested = {}
+__lock = threading.Lock()
+__started = threading.Event()
+__leader_file = None
+
+
+def mark_requested(country):
+    with __lock:
+        __last_requested[country] = time.time()
+
+
+def start():
+    """Function starts the scheduler in a daemon thread, once per process"""
+    if __started.is_set():
+        return
+    __started.set()
+    threading.Thread(target=run_forever, name='prefetch', daemon=True).start()
+
+
+def run_forever():
+    while True:
+        started = time.time()
+        try:
+            if is_leader():
+                run_once()
+        except Exception:
+            pass  # Never let one bad round stop the scheduler.
+        # Jitter keeps several servers (or workers) from hitting the API in lockstep.
+        interval = const.PREFETCH_INTERVAL * random.uniform(0.9, 1.1)
+        time.sleep(max(0, interval - (time.time() - started)))
+
+
+def is_leader():
+    """Function returns True if this process holds the prefetch lock, taking it when it is free"""
+    global __leader_file
+    if __leader_file is None:
+        os.makedirs(const.CACHE_DIR, exist_ok=True)
+        leader_file = open(os.path.join(const.CACHE_DIR, 'prefetch.lock'), 'w')
+        try:
+            fcntl.flock(leader_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            leader_file.close()
+            return False
+        # Held until the process exits, the OS releases it even on a crash.
+        __leader_file = leader_file
+    return True
+
+
+def run_once():
+    """Function refreshes the summary and every stale country, returns the number of fetches made"""
+    fetched = int(data.refresh_cache(const.WORLD, const.SUMMARY_LABEL, const.PREFETCH_MAX_AGE))
+    with ThreadPoolExecutor(max_workers=const.PREFETCH_CONCURRENCY) as executor:
+        fetched += sum(executor.map(__refresh_country, ordered_countries()))
+    return fetched
+
+
+def ordered_countries():
+    """Function returns every country slug, the most recently requested first"""
+    with __lock:
+        recent = sorted(__last_requested, key=__last_requested.get, reverse=True)
+    recent_set = set(recent)
+    return recent + [country for country in countries.slugs() if country not in recent_set]
+
+
+def __refresh_country(country):
+    time.sleep(random.uniform(0, const.PREFETCH_JITTER))
+    fetched = 0
+    for label in const.LABELS:
+        try:
+            fetched += data.refresh_cache(country, label, const.PREFETCH_MAX_AGE)
+        except Exception:
+            break  # Upstream failed for this country, try again next round.
+    return fetched
+
+
+if __name__ == '__main__':
+    run_forever()
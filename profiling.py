@@ -0,0 +1,122 @@
+"""Opt-in profiling of Dash callback requests.
+
+Nothing is profiled unless enabled, either per request (COVID_PROFILE_REQUESTS=1 and the request
+carries the X-Dash-Profile header or a ?profile=1 query flag) or by COVID_PROFILE_THRESHOLD_MS.
+In threshold mode requests are only timed, as cProfile slows a callback down several times over.
+A callback slower than the threshold gets its next call profiled in full, and that profile is only
+kept if the call is over the threshold too. Profiles are written to PROFILE_DIR as
+<time>-<callback>-<inputs>.prof, named after the inputs of the profiled call (load with pstats or
+snakeviz), with a .txt summary next to it. Only the newest PROFILE_KEEP are kept.
+"""
+import cProfile
+import glob
+import hashlib
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+
+import flask
+import constants as const
+
+HEADER = 'X-Dash-Profile'
+QUERY_FLAG = 'profile'
+
+# Callbacks (by output) that went over the threshold and get their next call profiled.
+__slow = set()
+__slow_lock = threading.Lock()
+
+
+def instrument(server):
+    """Function adds the profiling hooks around the Dash callback dispatch of the Flask server"""
+    if not const.PROFILE_REQUESTS and not const.PROFILE_THRESHOLD_MS:
+        return  # Off: normal requests pay nothing.
+
+    @server.before_request
+    def start_profile():
+        if not flask.request.path.endswith('/_dash-update-component'):
+            return
+        requested = const.PROFILE_REQUESTS and (flask.request.headers.get(HEADER) == '1' or
+                                                flask.request.args.get(QUERY_FLAG) == '1')
+        output = (flask.request.get_json(silent=True) or {}).get('output')
+        if not requested and not const.PROFILE_THRESHOLD_MS:
+            return
+        profiler = None
+        if requested or __take_slow(output):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        flask.g.profile = (profiler, time.perf_counter(), output, requested)
+
+    @server.after_request
+    def stop_profile(response):
+        profile = flask.g.pop('profile', None)
+        if profile is None:
+            return response
+        profiler, started, output, requested = profile
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if profiler is None:
+            if const.PROFILE_THRESHOLD_MS and elapsed_ms >= const.PROFILE_THRESHOLD_MS:
+                with __slow_lock:
+                    __slow.add(output)
+            return response
+        profiler.disable()
+        if not requested and elapsed_ms < const.PROFILE_THRESHOLD_MS:
+            return response  # Not slow this time, the next slow call flags the callback again.
+        try:
+            __dump(profiler, elapsed_ms)
+        except OSError:
+            pass  # Profiling must never break the request.
+        return response
+
+
+def __take_slow(output):
+    """Function checks whether a callback went over the threshold and clears its flag"""
+    with __slow_lock:
+        if output in __slow:
+            __slow.discard(output)
+            return True
+        return False
+
+
+def __dump(profiler, elapsed_ms):
+    body = flask.request.get_json(silent=True) or {}
+    callback = flask.g.get('callback_name') or body.get('output', 'unknown')
+    inputs = body.get('inputs', [])
+    name = '{}-{}-{}'.format(time.strftime('%Y%m%d-%H%M%S'), __slug(callback), __describe(inputs))
+
+    os.makedirs(const.PROFILE_DIR, exist_ok=True)
+    path = os.path.join(const.PROFILE_DIR, name)
+    profiler.dump_stats(path + '.prof')
+
+    summary = io.StringIO()
+    summary.write('callback: {}\nelapsed: {:.1f} ms\ninputs: {}\n\n'.format(
+        callback, elapsed_ms, json.dumps(inputs, default=str)[:2000]))
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(40)
+    with open(path + '.txt', 'w') as f:
+        f.write(summary.getvalue())
+    __rotate()
+
+
+def __describe(inputs):
+    """Function names a request by its short input values, plus a hash of all of them"""
+    values = [str(item.get('value')) for item in inputs if isinstance(item, dict)]
+    short = '_'.join(value for value in values if len(value) <= 20)
+    digest = hashlib.sha1(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()[:8]
+    return '{}-{}'.format(__slug(short)[:60], digest) if short else digest
+
+
+def __slug(text):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(text)).strip('_.') or 'none'
+
+
+def __rotate():
+    profiles = sorted(glob.glob(os.path.join(const.PROFILE_DIR, '*.prof')), key=os.path.getmtime)
+    for path in profiles[:max(0, len(profiles) - const.PROFILE_KEEP)]:
+        for extension in ('.prof', '.txt'):
+            try:
+                os.remove(path[:-len('.prof')] + extension)
+            except OSError:
+                pass
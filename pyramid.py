@@ -0,0 +1,93 @@
+"""Multi-resolution (daily / weekly / monthly) views of the main-graph traces.
+
+Each series is aggregated once per level and memoized. A figure carries at most MAX_POINTS points
+per trace for the whole history, and when zoomed in the visible range is re-sent at the finest
+level that fits MAX_POINTS while the rest of the history stays at the coarse level.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import constants as const
+
+LEVELS = [('daily', None), ('weekly', 'W'), ('monthly', 'MS')]
+
+# (series key, how) -> [level series...], least recently used first.
+__levels = OrderedDict()
+__levels_lock = threading.Lock()
+__LEVELS_CACHE_SIZE = 512
+
+
+def visible_range(relayout):
+    """Function returns the (start, end) timestamps of the x axis in main-graph.relayoutData, or None"""
+    if not relayout:
+        return None
+    if 'xaxis.range[0]' in relayout and 'xaxis.range[1]' in relayout:
+        bounds = relayout['xaxis.range[0]'], relayout['xaxis.range[1]']
+    elif 'xaxis.range' in relayout:
+        bounds = relayout['xaxis.range']
+    else:
+        return None
+    start, end = (pd.Timestamp(bound).tz_localize(None) if pd.Timestamp(bound).tzinfo else pd.Timestamp(bound)
+                  for bound in bounds)
+    return min(start, end), max(start, end)
+
+
+def is_reset(relayout):
+    """Function checks whether relayoutData asks for the whole history again (double click, ALL button)"""
+    return bool(relayout) and bool(relayout.get('xaxis.autorange'))
+
+
+def reduce_traces(traces, x_range=None, max_points=None):
+    """Function returns the traces (plotly json dicts) with x/y reduced for the visible range,
+    bars are averaged per bucket (keeping the daily scale) and lines keep the last value of a bucket"""
+    max_points = max_points or const.MAX_POINTS
+    reduced = []
+    for trace in traces:
+        if trace.get('x') is None or trace.get('y') is None:
+            reduced.append(trace)
+            continue
+        how = 'mean' if trace.get('type') == 'bar' else 'last'
+        series = __reduce(trace['x'], trace['y'], how, x_range, max_points)
+        reduced.append(dict(trace, x=series.index.strftime('%Y-%m-%d').tolist(), y=series.to_numpy()))
+    return reduced
+
+
+def __reduce(x, y, how, x_range, max_points):
+    levels = __get_levels(x, y, how)
+    coarse = next((level for level in levels if len(level) <= max_points), levels[-1])
+    if x_range is None:
+        return coarse
+
+    start, end = x_range
+    for level in levels:
+        fine = level[(level.index >= start) & (level.index <= end)]
+        if len(fine) <= max_points:
+            break
+    outside = coarse[(coarse.index < start) | (coarse.index > end)]
+    return pd.concat([outside, fine]).sort_index()
+
+
+def __get_levels(x, y, how):
+    y = np.asarray(y, dtype=np.float64)
+    x = pd.Index(x)
+    key = (hashlib.md5(y.tobytes()).hexdigest(), len(x), str(x[0]) if len(x) else '', str(x[-1]) if len(x) else '',
+           how)
+    with __levels_lock:
+        if key in __levels:
+            __levels.move_to_end(key)
+            return __levels[key]
+
+    dates = pd.to_datetime(x, utc=True).tz_localize(None)
+    daily = pd.Series(y, index=dates)
+    levels = [daily]
+    for _, frequency in LEVELS[1:]:
+        buckets = daily.resample(frequency, label='left', closed='left')
+        levels.append((buckets.mean() if how == 'mean' else buckets.last()).dropna())
+
+    with __levels_lock:
+        __levels[key] = levels
+        while len(__levels) > __LEVELS_CACHE_SIZE:
+            __levels.popitem(last=False)
+    return levels
@@ -0,0 +1,91 @@
+"""Production entry point running the app in several worker processes behind one listening socket.
+
+Uses gunicorn when it is installed, otherwise forks the workers itself and serves with werkzeug.
+Workers share the on-disk cache, the cube, the figure store and a single prefetch leader,
+so adding a worker does not add upstream traffic. Settings come from COVID_BIND/WORKERS/THREADS.
+Prefetching is off unless enabled, this entry point enables it (COVID_PREFETCH=0 turns it off).
+Whichever worker answers /metrics reports the samples of all of them (see telemetry.py).
+"""
+import glob
+import os
+import signal
+import socket
+import sys
+import constants as const
+
+
+def main():
+    __share_metrics()
+    __enable_prefetch()
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        __prefork()
+    else:
+        __gunicorn()
+
+
+def __share_metrics():
+    """ Helper function pointing every worker at one metrics directory, emptied of a previous run's samples """
+    const.METRICS_DIR = const.METRICS_DIR or os.path.join(const.CACHE_DIR, 'metrics')
+    os.environ['COVID_METRICS_DIR'] = const.METRICS_DIR
+    for path in glob.glob(os.path.join(const.METRICS_DIR, '*.json')):
+        os.remove(path)
+
+
+def __enable_prefetch():
+    """ Helper function turning the prefetch scheduler on in the workers, unless COVID_PREFETCH says otherwise """
+    os.environ.setdefault('COVID_PREFETCH', '1')
+    const.PREFETCH_ENABLED = os.environ['COVID_PREFETCH'] == '1'
+
+
+def __gunicorn():
+    sys.argv = ['gunicorn', 'wsgi:application', '--bind', const.SERVER_BIND,
+                '--workers', str(const.SERVER_WORKERS), '--threads', str(const.SERVER_THREADS),
+                '--worker-class', 'gthread']
+    from gunicorn.app.wsgiapp import run
+    run()
+
+
+def __prefork():
+    """ Helper function binding the socket once and forking workers that accept on it """
+    host, port = const.SERVER_BIND.rsplit(':', 1)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, int(port)))
+    sock.listen(128)
+    sock.set_inheritable(True)
+
+    workers = set()
+    for _ in range(const.SERVER_WORKERS):
+        workers.add(__spawn(sock))
+
+    def stop(*_):
+        for pid in workers:
+            os.kill(pid, signal.SIGTERM)
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while True:
+        # Replace workers that die, the prefetch lock moves to one of the survivors.
+        pid, _ = os.wait()
+        workers.discard(pid)
+        workers.add(__spawn(sock))
+
+
+def __spawn(sock):
+    pid = os.fork()
+    if pid:
+        return pid
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    from werkzeug.serving import make_server
+    from wsgi import application
+    host, port = sock.getsockname()[:2]
+    make_server(host, port, application, threaded=True, fd=sock.fileno()).serve_forever()
+    os._exit(0)
+
+
+if __name__ == '__main__':
+    main()
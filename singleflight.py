@@ -0,0 +1,85 @@
+"""Single-flight execution: concurrent calls for the same key share one run of the work.
+
+Threads of a process wait on the call already in flight. Across worker processes the leader
+holds a file lock per key in CACHE_DIR/locks. Once it has the lock, `check` is asked whether a
+call that just finished (in this or another process) already produced the result, and the work
+only runs if it did not.
+"""
+import fcntl
+import hashlib
+import os
+import threading
+import constants as const
+
+# Calls made, calls served by another thread's or process' run, and leaders that found a result
+# already there without waiting (written before the call, not by a run it overlapped).
+__stats = dict(calls=0, coalesced_threads=0, coalesced_processes=0, fresh=0)
+__lock = threading.Lock()
+
+# Key -> call in flight in this process.
+__calls = {}
+
+
+class Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def do(key, work, check=None):
+    """Function returns work() run once per key at a time, unless check() returns a result to reuse"""
+    with __lock:
+        __stats['calls'] += 1
+        call = __calls.get(key)
+        leader = call is None
+        if leader:
+            call = __calls[key] = Call()
+        else:
+            __stats['coalesced_threads'] += 1
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = __run(key, work, check)
+    except Exception as error:
+        call.error = error
+        raise
+    finally:
+        with __lock:
+            del __calls[key]
+        call.done.set()
+    return call.result
+
+
+def stats():
+    with __lock:
+        return dict(__stats)
+
+
+def __run(key, work, check):
+    """ Helper function running work under the key's file lock, unless check finds it done meanwhile """
+    directory = os.path.join(const.CACHE_DIR, 'locks')
+    os.makedirs(directory, exist_ok=True)
+    name = hashlib.md5(repr(key).encode()).hexdigest()
+    with open(os.path.join(directory, name + '.lock'), 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            waited = False
+        except OSError:
+            # Another process is running it, wait for it to finish.
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            waited = True
+        try:
+            result = check() if check is not None else None
+            if result is not None:
+                with __lock:
+                    __stats['coalesced_processes' if waited else 'fresh'] += 1
+                return result
+            return work()
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,48 @@
+import hashlib
+import threading
+import pandas as pd
+
+# Latest df per (country, label) held in this process: key -> (version, df).
+__frames = {}
+__lock = threading.Lock()
+
+HANDLE_KEYS = {'country', 'label', 'version'}
+
+
+def put(country, label, df):
+    """Function keeps a df in process memory and returns the small handle stored in the browser"""
+    version = data_version(df)
+    with __lock:
+        __frames[(country, label)] = (version, df)
+    return dict(country=country, label=label, version=version)
+
+
+def get(handle, load):
+    """Function resolves a handle to its df, calling load(country, label) if this process does not hold it"""
+    key = (handle['country'], handle['label'])
+    with __lock:
+        entry = __frames.get(key)
+    if entry is not None and entry[0] == handle['version']:
+        return entry[1]
+
+    # Unknown to this process (restart, another worker or an older version): reload it.
+    df = load(*key)
+    put(handle['country'], handle['label'], df)
+    return df
+
+
+def latest(country, label):
+    """Function returns the last df this process held for (country, label) whatever its version, or None"""
+    with __lock:
+        entry = __frames.get((country, label))
+    return None if entry is None else entry[1]
+
+
+def is_handle(payload):
+    return isinstance(payload, dict) and set(payload) == HANDLE_KEYS
+
+
+def data_version(df):
+    """Function returns a short content hash of a df, identical across processes for identical data"""
+    hashes = pd.util.hash_pandas_object(df, index=False).values
+    return hashlib.md5(hashes.tobytes()).hexdigest()[:12]
@@ -0,0 +1,254 @@
+"""Prometheus-style instrumentation of the Dash callbacks and the upstream API, served on /metrics.
+
+Only the standard library is used, recording a sample is a bisect and a few increments under a lock.
+With several worker processes (serve.py sets const.METRICS_DIR), every process writes a snapshot of
+its samples to METRICS_DIR/<pid>.json every few seconds and /metrics, whichever worker answers it,
+sums the snapshots of all of them. Counters of exited workers are kept so totals never go backwards,
+their gauges are dropped.
+"""
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+import flask
+from dash.exceptions import PreventUpdate
+import constants as const
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+# Everything rendered on /metrics, in registration order.
+__registry = []
+
+
+class Counter:
+    def __init__(self, name, documentation, label_names):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.__values = {}
+        self.__lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self.__lock:
+            self.__values[labels] = self.__values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        with self.__lock:
+            return self.__values.get(labels, 0)
+
+    def snapshot(self):
+        with self.__lock:
+            return dict(self.__values)
+
+    def render(self, values):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation), '# TYPE {} counter'.format(self.name)]
+        for labels, value in sorted(values.items()):
+            lines.append('{}{} {}'.format(self.name, format_labels(self.label_names, labels), value))
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, label_names, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self.__series = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self.__lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__series.get(labels)
+            if series is None:
+                series = self.__series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        with self.__lock:
+            return {labels: list(series) for labels, series in self.__series.items()}
+
+    def render(self, values):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation), '# TYPE {} histogram'.format(self.name)]
+        for labels, series in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                lines.append('{}_bucket{} {}'.format(self.name, format_labels(
+                    self.label_names + ('le',), labels + (bound,)), cumulative))
+            label_text = format_labels(self.label_names, labels)
+            lines.append('{}_sum{} {}'.format(self.name, label_text, series[-1]))
+            lines.append('{}_count{} {}'.format(self.name, label_text, cumulative))
+        return lines
+
+
+class Gauge:
+    """Gauge read at scrape time from a function returning {labels tuple: value}.
+    Values of worker processes are summed, unless per_process is False because collect already
+    returns a value for all of them (e.g. a ratio computed from aggregated())"""
+
+    def __init__(self, name, documentation, label_names, collect, per_process=True):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.collect = collect
+        self.per_process = per_process
+
+    def snapshot(self):
+        return self.collect()
+
+    def render(self, values):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation), '# TYPE {} gauge'.format(self.name)]
+        for labels, value in sorted(values.items()):
+            lines.append('{}{} {}'.format(self.name, format_labels(self.label_names, labels), value))
+        return lines
+
+
+def register(metric):
+    """Function adds a metric to /metrics and returns it"""
+    __registry.append(metric)
+    return metric
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ['{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+             for name, value in zip(names, values)]
+    return '{' + ','.join(pairs) + '}'
+
+
+CALLBACK_SECONDS = register(Histogram(
+    'dash_callback_duration_seconds', 'Time spent in Dash callbacks.', ('callback', 'outcome')))
+CALLBACK_REQUEST_BYTES = register(Histogram(
+    'dash_callback_request_bytes', 'Size of Dash callback request bodies.', ('callback',), SIZE_BUCKETS))
+CALLBACK_RESPONSE_BYTES = register(Histogram(
+    'dash_callback_response_bytes', 'Size of Dash callback response bodies.', ('callback',), SIZE_BUCKETS))
+STORE_DECODES = register(Counter(
+    'dash_store_decodes_total', 'dcc.Store payloads decoded back to dfs.', ('callback',)))
+UPSTREAM_SECONDS = register(Histogram(
+    'upstream_request_duration_seconds', 'Time spent in requests to the upstream API.', ('endpoint', 'status')))
+
+
+def timed_callback(name):
+    """Decorator recording the duration and outcome (ok, prevented, error) of a Dash callback"""
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if flask.has_request_context():
+                flask.g.callback_name = name
+            started = time.perf_counter()
+            outcome = 'error'
+            try:
+                result = function(*args, **kwargs)
+                outcome = 'ok'
+                return result
+            except PreventUpdate:
+                outcome = 'prevented'
+                raise
+            finally:
+                CALLBACK_SECONDS.observe(time.perf_counter() - started, name, outcome)
+        return wrapper
+    return decorator
+
+
+def observe_upstream(endpoint, status, seconds):
+    UPSTREAM_SECONDS.observe(seconds, endpoint, str(status))
+
+
+def observe_decode():
+    callback = flask.g.get('callback_name', 'unknown') if flask.has_request_context() else 'offline'
+    STORE_DECODES.inc(callback)
+
+
+def render():
+    lines = []
+    for metric in __registry:
+        lines.extend(metric.render(aggregated(metric.name)))
+    return '\n'.join(lines) + '\n'
+
+
+def aggregated(name):
+    """Function returns the {labels tuple: value} of a registered metric summed over every worker process"""
+    metric = next(metric for metric in __registry if metric.name == name)
+    if not const.METRICS_DIR or (isinstance(metric, Gauge) and not metric.per_process):
+        return metric.snapshot()
+
+    flush()
+    total = {}
+    for pid, snapshot in __read_snapshots():
+        if isinstance(metric, Gauge) and not __alive(pid):
+            continue
+        for labels, value in snapshot.get(name, []):
+            labels = tuple(labels)
+            if isinstance(value, list):
+                current = total.get(labels, [0] * len(value))
+                total[labels] = [a + b for a, b in zip(current, value)]
+            else:
+                total[labels] = total.get(labels, 0) + value
+    return total
+
+
+def flush():
+    """Function writes this process' samples to const.METRICS_DIR for the other workers to read"""
+    snapshot = {metric.name: [[list(labels), value] for labels, value in metric.snapshot().items()]
+                for metric in __registry if not isinstance(metric, Gauge) or metric.per_process}
+    os.makedirs(const.METRICS_DIR, exist_ok=True)
+    path = os.path.join(const.METRICS_DIR, '{}.json'.format(os.getpid()))
+    tmp_path = '{}.{}.tmp'.format(path, threading.get_ident())
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def __read_snapshots():
+    for path in glob.glob(os.path.join(const.METRICS_DIR, '*.json')):
+        try:
+            with open(path) as f:
+                yield int(os.path.basename(path)[:-len('.json')]), json.load(f)
+        except (OSError, ValueError):
+            continue  # Removed or replaced while reading, it is picked up by the next scrape.
+
+
+def __alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def __flush_forever():
+    while True:
+        time.sleep(const.METRICS_FLUSH_INTERVAL)
+        try:
+            flush()
+        except OSError:
+            pass  # Metrics must never take a worker down.
+
+
+def instrument(server):
+    """Function adds the payload size hooks and the /metrics route to the Flask server behind the app"""
+    @server.after_request
+    def record_payload_sizes(response):
+        if flask.request.path.endswith('/_dash-update-component'):
+            name = flask.g.get('callback_name', 'unknown')
+            CALLBACK_REQUEST_BYTES.observe(flask.request.content_length or 0, name)
+            if not response.direct_passthrough:
+                CALLBACK_RESPONSE_BYTES.observe(response.calculate_content_length() or 0, name)
+        return response
+
+    if const.METRICS_DIR:
+        threading.Thread(target=__flush_forever, name='metrics-flush', daemon=True).start()
+
+    @server.route('/metrics')
+    def metrics_endpoint():
+        return flask.Response(render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,120 @@
+"""Counts the dcc.Store decodes of the callbacks driven through the Flask test client, offline.
+
+A country change, graph switches and date picks must decode nothing, the dfs and the summary stay on the server.
+"""
+import os
+import sys
+import tempfile
+from unittest import mock
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# Keep the test away from the real cache, bulk store, figure store and scheduler.
+__scratch = tempfile.mkdtemp(prefix='covid-test-')
+os.environ['COVID_CACHE_DIR'] = os.path.join(__scratch, 'cache')
+os.environ['COVID_BULK_STORE_DIR'] = os.path.join(__scratch, 'bulk_store')
+os.environ['COVID_SHARED_FIGURE_CACHE'] = '0'
+os.environ['COVID_PREFETCH'] = '0'
+
+import app  # noqa: E402
+import cache  # noqa: E402
+import constants as const  # noqa: E402
+import data  # noqa: E402
+import fixtures  # noqa: E402
+import telemetry  # noqa: E402
+
+COUNTRY = fixtures.RECORD_COUNTRY
+DAYS = 200
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def fake_get(url, timeout=None):
+    if url.endswith('/summary'):
+        return FakeResponse(fixtures.summary_response())
+    return FakeResponse(fixtures.dayone_response(url.rsplit('/', 1)[-1], DAYS))
+
+
+@pytest.fixture(scope='module')
+def client():
+    with mock.patch.object(data.session, 'get', fake_get):
+        cache.write(const.WORLD, const.SUMMARY_LABEL, getattr(data, '__fetch_summary_df')())
+        yield app.app.server.test_client()
+
+
+def decodes(callback):
+    return telemetry.STORE_DECODES.value(callback)
+
+
+def call(client, output, inputs, state=(), changed=None):
+    """Function posts a callback request like the Dash renderer and returns the updated props"""
+    callback = next(item for item in client.get('/_dash-dependencies').get_json() if item['output'] == output)
+    outputs = [dict(id=part.rsplit('.', 1)[0], property=part.rsplit('.', 1)[1])
+               for part in output.strip('.').split('...')]
+    body = dict(
+        output=output,
+        outputs=outputs if output.startswith('..') else outputs[0],
+        inputs=[dict(item, value=inputs[item['id']]) for item in callback['inputs']],
+        state=[dict(item, value=dict(state).get(item['id'])) for item in callback['state']],
+        changedPropIds=['{}.{}'.format(changed, callback['inputs'][0]['property'])] if changed else [],
+    )
+    response = client.post('/_dash-update-component', json=body)
+    assert response.status_code == 200
+    return {component: props for component, props in response.get_json()['response'].items()}
+
+
+def find_output(client, first_output):
+    return next(item['output'] for item in client.get('/_dash-dependencies').get_json()
+                if item['output'].lstrip('.').startswith(first_output))
+
+
+def change_country(client, country):
+    return call(client, find_output(client, 'current-country.data'), {'countries-dropdown': country},
+                [('graphs-dropdown', const.GRAPH_TYPE.SCATTER_TOTAL_CASES)], 'countries-dropdown')
+
+
+def test_country_change_decodes_nothing(client):
+    before = decodes('update_country')
+    props = change_country(client, COUNTRY)
+    # The series are rendered from the dfs just loaded and the summary is read on the server.
+    assert decodes('update_country') == before
+    assert 'confirmed-data' not in props and 'world-summary-data' not in props
+    assert props['main-graph']['figure']['data']
+    assert props['total_cases_in_table']['children'].startswith('Total Confirmed')
+    assert props['map-url']['data'].startswith('/maps/')
+    assert len(props['data-handles']['data']) == len(const.LABELS)
+
+
+def test_graph_switch_and_date_pick_decode_nothing(client):
+    props = change_country(client, COUNTRY)
+    handles = props['data-handles']['data']
+    state = [('data-handles', handles), ('current-country', COUNTRY)]
+
+    before = decodes('update_graph')
+    for graph_type in (const.GRAPH_TYPE.BAR_DAILY_CONFIRMED, const.GRAPH_TYPE.SCATTER_ROLLING_AVERAGE):
+        props = call(client, find_output(client, 'main-graph.figure@'),
+                     {'graphs-dropdown': graph_type, 'main-graph': None}, state, 'graphs-dropdown')
+        assert props['main-graph']['figure']['data']
+    assert decodes('update_graph') == before
+
+    before = decodes('update_overview')
+    props = call(client, find_output(client, 'daily-cases.children@'),
+                 {'overview-date-picker': '2020-03-01'}, state, 'overview-date-picker')
+    assert props['daily-cases']['children'].startswith('Cases')
+    assert decodes('update_overview') == before
@@ -0,0 +1,46 @@
+"""Records the benchmark fixtures from a mocked API and checks they are used over the synthesized ones."""
+import os
+import sys
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import constants as const  # noqa: E402
+import fixtures  # noqa: E402
+
+DAYS = 30
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def fake_get(url, timeout=None):
+    if url.endswith('/summary'):
+        return FakeResponse(dict(Global={}, Countries=[dict(Slug='recorded')], Date='2020-06-01T00:00:00Z'))
+    label = url.rsplit('/', 1)[-1]
+    return FakeResponse([dict(record, Province='recorded') for record in fixtures.dayone_response(label, DAYS)])
+
+
+def test_record_is_used_and_reported(tmp_path):
+    with mock.patch.object(fixtures, 'FIXTURE_DIR', str(tmp_path)):
+        assert set(fixtures.sources(DAYS).values()) == {'synthesized'}
+        with mock.patch('requests.get', fake_get):
+            fixtures.record()
+
+        assert set(fixtures.sources(DAYS).values()) == {'recorded'}
+        assert fixtures.summary_response()['Countries'] == [dict(Slug='recorded')]
+        for label in const.LABELS:
+            assert {record['Province'] for record in fixtures.dayone_response(label, DAYS)} == {'recorded'}
+        # Longer histories than the recording fall back to synthesized responses.
+        assert set(fixtures.sources(DAYS + 1).values()) == {'synthesized', 'recorded'}
+        assert len(fixtures.dayone_response('confirmed', DAYS + 1)) == DAYS + 1
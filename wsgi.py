@@ -0,0 +1,10 @@
+"""WSGI entry point for production servers, e.g. `gunicorn wsgi:application` or `python serve.py`"""
+import constants as const
+import prefetch
+from app import app
+
+application = server = app.server
+
+if const.PREFETCH_ENABLED:
+    # Opt-in (serve.py turns it on). Every worker starts the scheduler, only the leader lock holder fetches.
+    prefetch.start()